@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from api.models import NotificationPreference, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Create default notification preferences for users without them '
+        '(the backfill migration 0008 skips when SKIP_HEAVY_MIGRATIONS is set)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of preferences to create per INSERT (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        user_ids = User.objects.filter(
+            notification_preferences__isnull=True
+        ).values_list('pk', flat=True).order_by('pk')
+
+        created = 0
+        batch = []
+        for user_id in user_ids.iterator(chunk_size=batch_size):
+            batch.append(NotificationPreference(user_id=user_id))
+            if len(batch) >= batch_size:
+                # A user's post_save signal may have created theirs meanwhile
+                NotificationPreference.objects.bulk_create(batch, ignore_conflicts=True)
+                created += len(batch)
+                batch = []
+        if batch:
+            NotificationPreference.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Created notification preferences for {created} users')
+        )
@@ -4,13 +4,15 @@ This command trains ML models and generates recommendations for users.
 """
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connections, transaction
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from datetime import timedelta
 import logging
 import os
+import multiprocessing
+from multiprocessing import cpu_count
 
 from api.models import UserRecommendation, UserBehavior, Provider
 from api.utils.recommendation_engine import HybridRecommendationEngine, ColdStartHandler
@@ -19,6 +21,24 @@ from api.utils.ab_testing import ABTestManager
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Command whose trained engines the scoring pool's workers use. Set in the
+# parent before the pool forks, so every worker inherits the trained engines
+# and the memory-mapped provider factors instead of loading its own.
+_WORKER_COMMAND = None
+
+
+def _init_worker():
+    """Pool initializer: drop DB connections inherited from the parent"""
+    connections.close_all()
+
+
+def _score_batch(user_ids):
+    """Build recommendations for one batch of users inside a worker process"""
+    command = _WORKER_COMMAND
+    return command.build_user_batch(
+        user_ids, command.max_recommendations, command.min_score
+    )
+
 
 class Command(BaseCommand):
     help = 'Build personalized recommendations for users'
@@ -67,6 +87,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Skip model training (use existing models)'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes for scoring user batches (default: 1, 0 = one per CPU core)'
+        )
     
     def handle(self, *args, **options):
         """Main command handler"""
@@ -81,9 +107,7 @@ class Command(BaseCommand):
         
         try:
             # Initialize recommendation engines
-            self.hybrid_engine = HybridRecommendationEngine()
-            self.cold_start_handler = ColdStartHandler()
-            self.ab_test_manager = ABTestManager()
+            self.init_engines()
             
             # Train models if needed
             if not options['skip_training']:
@@ -105,7 +129,8 @@ class Command(BaseCommand):
                         options['batch_size'],
                         options['max_recommendations'],
                         options['min_score'],
-                        options['full_rebuild']
+                        options['full_rebuild'],
+                        workers=options['workers'] or cpu_count()
                     )
             
             if self.verbosity >= 1:
@@ -117,6 +142,12 @@ class Command(BaseCommand):
             logger.error(f"Error in recommendation building: {e}")
             raise CommandError(f'Recommendation building failed: {e}')
     
+    def init_engines(self):
+        """Create the recommendation engines and A/B test manager"""
+        self.hybrid_engine = HybridRecommendationEngine()
+        self.cold_start_handler = ColdStartHandler()
+        self.ab_test_manager = ABTestManager()
+    
     def train_models(self):
         """Train all recommendation models"""
         if self.verbosity >= 1:
@@ -174,8 +205,10 @@ class Command(BaseCommand):
             if self.verbosity >= 2:
                 self.stdout.write(f'Saved CF model to {cf_model_path}')
     
-    def build_all_recommendations(self, batch_size, max_recommendations, min_score, full_rebuild):
+    def build_all_recommendations(self, batch_size, max_recommendations, min_score, full_rebuild,
+                                  workers=1):
         """Build recommendations for all users"""
+        global _WORKER_COMMAND
         # Get users with behavior or new users
         if full_rebuild:
             users_queryset = User.objects.filter(is_active=True)
@@ -198,31 +231,69 @@ class Command(BaseCommand):
             self.stdout.write(f'Building recommendations for {total_users} users...')
         
         processed = 0
+        batches = (
+            list(user_batch.values_list('id', flat=True))
+            for user_batch in self.batch_queryset(users_queryset, batch_size)
+        )
         
-        for user_batch in self.batch_queryset(users_queryset, batch_size):
-            with transaction.atomic():
-                for user in user_batch:
-                    try:
-                        self.build_user_recommendations(
-                            user.id, max_recommendations, min_score
-                        )
-                        processed += 1
-                        
-                        if self.verbosity >= 2 and processed % 10 == 0:
-                            self.stdout.write(f'Processed {processed}/{total_users} users')
-                            
-                    except Exception as e:
-                        logger.error(f"Error building recommendations for user {user.id}: {e}")
+        if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            # Spawned children import this module, and api.models with it,
+            # before Django is set up, so the pool needs fork
+            logger.warning("Worker processes need the fork start method; scoring in this process")
+            workers = 1
+        if workers > 1 and connections['default'].vendor == 'sqlite':
+            # Forked workers can't share an in-memory SQLite database, and a
+            # file database serializes their writes anyway
+            logger.warning("Worker processes need a client/server database; scoring in this process")
+            workers = 1
+
+        if workers > 1:
+            # Scoring is CPU-bound and independent per batch, so fan batches out
+            # across processes; each worker opens its own DB connection
+            batches = list(batches)
+            connections.close_all()
+            self.max_recommendations = max_recommendations
+            self.min_score = min_score
+            _WORKER_COMMAND = self
+            # Explicitly fork: the default is spawn on macOS and from Python 3.14
+            context = multiprocessing.get_context('fork')
+            try:
+                with context.Pool(min(workers, len(batches)) or 1, initializer=_init_worker) as pool:
+                    for batch_processed in pool.imap_unordered(_score_batch, batches):
+                        processed += batch_processed
                         if self.verbosity >= 2:
-                            self.stdout.write(
-                                self.style.ERROR(f'Failed for user {user.id}: {e}')
-                            )
+                            self.stdout.write(f'Processed {processed}/{total_users} users')
+            finally:
+                _WORKER_COMMAND = None
+        else:
+            for user_ids in batches:
+                processed += self.build_user_batch(user_ids, max_recommendations, min_score)
+                if self.verbosity >= 2:
+                    self.stdout.write(f'Processed {processed}/{total_users} users')
         
         if self.verbosity >= 1:
             self.stdout.write(
                 self.style.SUCCESS(f'Completed recommendations for {processed} users')
             )
     
+    def build_user_batch(self, user_ids, max_recommendations, min_score):
+        """Build recommendations for a batch of users in one transaction"""
+        processed = 0
+        with transaction.atomic():
+            for user_id in user_ids:
+                try:
+                    self.build_user_recommendations(
+                        user_id, max_recommendations, min_score
+                    )
+                    processed += 1
+                except Exception as e:
+                    logger.error(f"Error building recommendations for user {user_id}: {e}")
+                    if self.verbosity >= 2:
+                        self.stdout.write(
+                            self.style.ERROR(f'Failed for user {user_id}: {e}')
+                        )
+        return processed
+    
     def build_user_recommendations(self, user_id, max_recommendations, min_score):
         """Build recommendations for a specific user"""
         try:
@@ -352,7 +423,7 @@ class Command(BaseCommand):
         if recent_locations:
             # Use most recent location
             latest_location = recent_locations[0]
-            return (float(latest_location.location_lat), float(latest_location.location_lng))
+            return (latest_location.location_lat, latest_location.location_lng)
         
         return None
     
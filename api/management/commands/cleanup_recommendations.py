@@ -130,10 +130,11 @@ class Command(BaseCommand):
             self.stdout.write(f'Found {count} expired recommendations')
         
         if not self.dry_run and count > 0:
-            with transaction.atomic():
-                deleted_count = queryset.delete()[0]
-                logger.info(f"Deleted {deleted_count} expired recommendations")
-                return deleted_count
+            # Batched deletes, each committed separately, instead of one
+            # transaction over every expired row
+            deleted_count = UserRecommendation.purge_expired(user_id=user_id)
+            logger.info(f"Deleted {deleted_count} expired recommendations")
+            return deleted_count
         
         return count
     
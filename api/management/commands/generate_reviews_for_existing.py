@@ -1,29 +1,50 @@
+import csv
+import io
+import os
 import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from django.utils import timezone
-from api.models import User, Provider, Review
+from api.models import User, Provider, Review, ReviewReport
 
 
-POSITIVE_COMMENTS = [
+POSITIVE_COMMENTS = (
     "Excellent service! Highly recommended.",
     "Very professional and timely work.",
     "Great experience, will hire again.",
     "Quality work at a fair price.",
     "Friendly and knowledgeable staff."
-]
+)
 
-NEUTRAL_COMMENTS = [
+NEUTRAL_COMMENTS = (
     "Service was okay, nothing exceptional.",
     "Average experience, could be better.",
     "Work was completed as expected.",
     "Decent service for the price.",
-]
+)
 
-NEGATIVE_COMMENTS = [
+NEGATIVE_COMMENTS = (
     "Not satisfied with the service.",
     "Had issues that were not fully resolved.",
     "Would not recommend based on my experience.",
-]
+)
+
+# Weighted rating distribution, with cumulative weights precomputed so
+# random.choices does not re-accumulate them on every call
+RATING_CHOICES = (1, 2, 3, 4, 5)
+RATING_CUM_WEIGHTS = (5, 15, 35, 70, 100)
+
+# Columns written by the raw insert paths
+RAW_INSERT_FIELDS = (
+    'user', 'provider', 'rating', 'comment', 'is_verified', 'status',
+    'reported_count', 'purchase_verified', 'created_at', 'updated_at',
+)
+
+# Rows fetched per round trip when streaming existing review pairs
+PAIR_CHUNK_SIZE = 2000
 
 
 class Command(BaseCommand):
@@ -42,88 +63,274 @@ class Command(BaseCommand):
             default=5,
             help="Maximum reviews to create per provider in this run"
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=int(os.environ.get('REVIEW_BULK_BATCH_SIZE', 1000)),
+            help="Rows per INSERT statement (default: $REVIEW_BULK_BATCH_SIZE or 1000, clamped per database backend)"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Threads inserting reviews in parallel, each on its own connection and transaction. "
+                 "Above 1 the run is no longer a single transaction: the orphan cleanup commits "
+                 "first and each thread commits its share (default: 1; gains flatten out past 2-4; "
+                 "ignored on SQLite)"
+        )
+
+    def get_batch_size(self, requested):
+        """Clamp the bulk insert batch size to what the database backend handles well"""
+        batch_size = max(1, requested)
+        if connection.vendor == 'sqlite':
+            # SQLite caps bound parameters per statement at 999
+            num_fields = len(Review._meta.concrete_fields)
+            return max(1, min(batch_size, 999 // num_fields))
+        if connection.vendor == 'postgresql':
+            # Multi-row INSERT throughput plateaus around 1,000 rows
+            return min(batch_size, 1000)
+        return min(batch_size, 10000)
+
+    def _insert_sql(self):
+        """Fields and quoted SQL fragments shared by the raw insert paths"""
+        quote = connection.ops.quote_name
+
+        def column(name):
+            return quote(Review._meta.get_field(name).column)
+
+        fields = [Review._meta.get_field(name) for name in RAW_INSERT_FIELDS]
+        columns = ', '.join(quote(f.column) for f in fields)
+        # A review that appeared since the pairs were chosen is real user data;
+        # never overwrite it, skip the generated row instead
+        conflict_clause = f"ON CONFLICT ({column('user')}, {column('provider')}) DO NOTHING"
+        return fields, quote(Review._meta.db_table), columns, conflict_clause
+
+    def _raw_insert(self, objs, batch_size):
+        """
+        Write reviews with hand-built multi-row INSERT ... ON CONFLICT DO NOTHING statements.
+
+        Skips bulk_create's per-object model machinery; values are still prepared
+        through the model fields so every backend gets the types it expects.
+        Fields with Python-side defaults (status, reported_count, ...) must be
+        listed explicitly because the columns have no database default.
+        Returns the number of rows inserted, not counting skipped conflicts.
+        """
+        fields, table, columns, conflict_clause = self._insert_sql()
+        placeholder = '(' + ', '.join(['%s'] * len(fields)) + ')'
+
+        inserted = 0
+        with connection.cursor() as cursor:
+            for start in range(0, len(objs), batch_size):
+                chunk = objs[start:start + batch_size]
+                params = []
+                for r in chunk:
+                    params.extend(f.get_db_prep_save(getattr(r, f.attname), connection) for f in fields)
+                cursor.execute(
+                    f"INSERT INTO {table} ({columns}) "
+                    f"VALUES {', '.join([placeholder] * len(chunk))} {conflict_clause}",
+                    params
+                )
+                inserted += cursor.rowcount
+        return inserted
+
+    def _copy_insert(self, objs):
+        """
+        Stream reviews into PostgreSQL with COPY, then insert them in one statement.
+
+        COPY has no conflict handling, so rows land in a temporary staging table
+        and are moved across with INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+        Returns the number of rows that statement inserted.
+        """
+        fields, table, columns, conflict_clause = self._insert_sql()
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for r in objs:
+            writer.writerow([f.get_db_prep_save(getattr(r, f.attname), connection) for f in fields])
+        buf.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE review_staging AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY review_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buf)
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM review_staging {conflict_clause}"
+            )
+            inserted = cursor.rowcount
+            cursor.execute("DROP TABLE review_staging")
+        return inserted
+
+    def _bulk_insert(self, objs, batch_size):
+        """
+        Insert reviews with multi-row INSERTs, halving the batch on failure.
+
+        Only a batch of a single row falls back to the per-row duplicate check,
+        so one bad row does not push the whole set onto the slow path.
+        Returns the number of reviews inserted; rows skipped because their
+        (user, provider) pair already has a review are not counted.
+        """
+        try:
+            # Savepoint so a failed insert leaves the outer transaction usable
+            with transaction.atomic():
+                if connection.vendor == 'postgresql':
+                    return self._copy_insert(objs)
+                if connection.features.supports_update_conflicts_with_target:
+                    # Backends that take a conflict target also take DO NOTHING with one
+                    return self._raw_insert(objs, batch_size)
+                # bulk_create doesn't report how many rows ignore_conflicts skipped
+                before = Review.objects.count()
+                Review.objects.bulk_create(objs, batch_size=batch_size, ignore_conflicts=True)
+                return Review.objects.count() - before
+        except Exception as e:
+            if len(objs) == 1:
+                r = objs[0]
+                try:
+                    # Skip if duplicate exists
+                    if Review.objects.filter(user_id=r.user_id, provider_id=r.provider_id).exists():
+                        return 0
+                    r.pk = None
+                    with transaction.atomic():
+                        r.save()
+                    return 1
+                except Exception:
+                    return 0
+            self.stdout.write(self.style.WARNING(
+                f"Bulk create of {len(objs)} reviews failed ({e}); retrying in smaller batches."
+            ))
+            mid = len(objs) // 2
+            return (
+                self._bulk_insert(objs[:mid], batch_size)
+                + self._bulk_insert(objs[mid:], batch_size)
+            )
+
+    def _insert_shard(self, objs, batch_size):
+        """Insert one shard of reviews from a worker thread on its own connection"""
+        try:
+            with transaction.atomic():
+                return self._bulk_insert(objs, batch_size)
+        finally:
+            # Django connections are per thread; don't leak one per worker
+            connection.close()
 
     def handle(self, *args, **options):
         per_provider = max(0, options["per_provider"]) or 0
         max_per_provider = max(per_provider, options["max"]) if options.get("max") else per_provider
+        batch_size = self.get_batch_size(options["batch_size"])
+        workers = max(1, options["workers"])
+
+        # Worker threads insert on their own connections, so they cannot share
+        # the outer transaction; see the parallel insert below
+        parallel = workers > 1 and connection.vendor != 'sqlite'
+
+        # One transaction for the whole run instead of a commit per write
+        with transaction.atomic():
+            # 1) Remove orphaned reviews (where provider_id no longer exists).
+            # Single DB-side DELETEs: no ids pulled into Python and no signal/cascade
+            # collection. Reports are the only rows referencing a review, so clear them first.
+            # Counted once up front; the final total is derived from it
+            pre_total = Review.objects.count()
+            orphan_qs = Review.objects.exclude(provider_id__in=Provider.objects.values('id'))
+            reports_qs = ReviewReport.objects.filter(review__in=orphan_qs.values('id'))
+            reports_qs._raw_delete(reports_qs.db)
+            orphan_count = orphan_qs._raw_delete(orphan_qs.db)
+            self.stdout.write(self.style.WARNING(f"Deleted {orphan_count} orphaned reviews."))
+
+            customers = np.fromiter(
+                User.objects.filter(role='customer').values_list('id', flat=True),
+                dtype=np.int64
+            )
+            if not customers.size:
+                self.stdout.write(self.style.ERROR("No customers found. Cannot generate reviews."))
+                return
+
+            # Provider ids with their current review counts, read from the
+            # denormalized column
+            provider_counts = list(
+                Provider.objects.filter(is_active=True)
+                .values_list('id', 'reviews_count')
+            )
+            if not provider_counts:
+                self.stdout.write(self.style.ERROR("No active providers found. Nothing to do."))
+                return
+
+            created = 0
+            pairs = []
+            now = timezone.now()
+            rng = np.random.default_rng()
+
+            providers = [pid for pid, _ in provider_counts]
+            # Preload reviewed (user, provider) pairs so membership checks stay in memory.
+            # Stream the tuples straight into the set rather than caching a full
+            # result list first.
+            existing_pairs = set(
+                Review.objects.filter(provider_id__in=providers)
+                .values_list('user_id', 'provider_id')
+                .iterator(chunk_size=PAIR_CHUNK_SIZE)
+            )
+
+            # First pass: decide which (customer, provider) pairs get a review
+            for pid, current_count in provider_counts:
+                target = min(max(per_provider - current_count, 0), max_per_provider)
+                if target <= 0:
+                    continue
+
+                # Pick distinct customers that have not reviewed this provider.
+                # Draw only a few candidates (extra to cover existing pairs) in
+                # C rather than shuffling the customer list per provider.
+                needed = target * 4
+                picks = rng.choice(customers, size=min(customers.size, needed), replace=False)
+                picked = 0
+                for uid in picks.tolist():
+                    if picked >= target:
+                        break
+                    if (uid, pid) not in existing_pairs:
+                        pairs.append((uid, pid))
+                        existing_pairs.add((uid, pid))
+                        picked += 1
+
+            # Second pass: draw all ratings, flags and comments in bulk
+            ratings = random.choices(RATING_CHOICES, cum_weights=RATING_CUM_WEIGHTS, k=len(pairs))
+            verified = random.choices((True, False), k=len(pairs))
+            tiers = ['positive' if r >= 4 else 'neutral' if r == 3 else 'negative' for r in ratings]
+            comment_draws = {
+                'positive': iter(random.choices(POSITIVE_COMMENTS, k=tiers.count('positive'))),
+                'neutral': iter(random.choices(NEUTRAL_COMMENTS, k=tiers.count('neutral'))),
+                'negative': iter(random.choices(NEGATIVE_COMMENTS, k=tiers.count('negative'))),
+            }
+            to_create = [
+                Review(
+                    user_id=uid,
+                    provider_id=pid,
+                    rating=rating,
+                    comment=next(comment_draws[tier]),
+                    is_verified=is_verified,
+                    # Both timestamps come from the single now captured above;
+                    # the raw write paths use them as-is instead of per-row pre_save
+                    created_at=now,
+                    updated_at=now
+                )
+                for (uid, pid), rating, tier, is_verified in zip(pairs, ratings, tiers, verified)
+            ]
+
+            if to_create and not parallel:
+                created = self._bulk_insert(to_create, batch_size)
+                # The bulk paths skip the Review signals that maintain provider stats
+                Provider.refresh_review_stats({pid for _, pid in pairs})
+
+        if to_create and parallel:
+            # Runs after the cleanup above has committed. Each shard commits in
+            # its own transaction, so a parallel run is not atomic as a whole:
+            # a failed shard leaves the others' reviews in place.
+            # Pairs are unique, so shards never conflict with each other
+            shards = [to_create[i::workers] for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                created = sum(executor.map(lambda shard: self._insert_shard(shard, batch_size), shards))
+            Provider.refresh_review_stats({pid for _, pid in pairs})
 
-        # 1) Remove orphaned reviews (where provider_id no longer exists)
-        existing_provider_ids = set(Provider.objects.values_list("id", flat=True))
-        orphan_qs = Review.objects.exclude(provider_id__in=existing_provider_ids)
-        orphan_count = orphan_qs.count()
-        if orphan_count:
-            # Delete in chunks to avoid long-running transactions on SQLite
-            BATCH = 1000
-            ids = list(orphan_qs.values_list('id', flat=True))
-            for i in range(0, len(ids), BATCH):
-                Review.objects.filter(id__in=ids[i:i+BATCH]).delete()
-        self.stdout.write(self.style.WARNING(f"Deleted {orphan_count} orphaned reviews."))
-
-        customers = list(User.objects.filter(role='customer').values_list('id', flat=True))
-        if not customers:
-            self.stdout.write(self.style.ERROR("No customers found. Cannot generate reviews."))
-            return
-
-        providers = list(Provider.objects.filter(is_active=True).values_list('id', flat=True))
-        if not providers:
-            self.stdout.write(self.style.ERROR("No active providers found. Nothing to do."))
-            return
-
-        created = 0
-        to_create = []
-        now = timezone.now()
-
-        for pid in providers:
-            current_count = Review.objects.filter(provider_id=pid).count()
-            target = min(max(per_provider - current_count, 0), max_per_provider)
-            if target <= 0:
-                continue
-
-            # Pick distinct customers that have not reviewed this provider
-            random.shuffle(customers)
-            picked = 0
-            for uid in customers:
-                if picked >= target:
-                    break
-                if not Review.objects.filter(user_id=uid, provider_id=pid).exists():
-                    # Weighted rating distribution
-                    rating = random.choices([1, 2, 3, 4, 5], weights=[5, 10, 20, 35, 30])[0]
-                    if rating >= 4:
-                        comment = random.choice(POSITIVE_COMMENTS)
-                    elif rating == 3:
-                        comment = random.choice(NEUTRAL_COMMENTS)
-                    else:
-                        comment = random.choice(NEGATIVE_COMMENTS)
-
-                    to_create.append(Review(
-                        user_id=uid,
-                        provider_id=pid,
-                        rating=rating,
-                        comment=comment,
-                        is_verified=random.choice([True, False]),
-                        created_at=now
-                    ))
-                    picked += 1
-
-        if to_create:
-            # Try bulk create; if it fails due to FK/unique, fall back to row-by-row insertion
-            try:
-                Review.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
-                created = len(to_create)
-            except Exception as e:
-                self.stdout.write(self.style.WARNING(f"Bulk create failed ({e}); falling back to per-row insert."))
-                created = 0
-                for r in to_create:
-                    try:
-                        # Skip if duplicate exists
-                        if not Review.objects.filter(user_id=r.user_id, provider_id=r.provider_id).exists():
-                            r.pk = None
-                            r.save()
-                            created += 1
-                    except Exception:
-                        continue
-
-        total_reviews = Review.objects.count()
+        total_reviews = pre_total - orphan_count + created
         self.stdout.write(self.style.SUCCESS(
             f"Created {created} new reviews. Total reviews now: {total_reviews}."
         ))
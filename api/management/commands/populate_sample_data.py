@@ -3,6 +3,7 @@ Management command to populate the database with sample data for testing
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from api.models import Category, Provider, Service, Address
 from decimal import Decimal
 
@@ -12,6 +13,7 @@ User = get_user_model()
 class Command(BaseCommand):
     help = 'Populates the database with sample data'
 
+    @transaction.atomic
     def handle(self, *args, **options):
         self.stdout.write('Creating sample data...')
 
@@ -27,15 +29,15 @@ class Command(BaseCommand):
             {'name': 'Roofing', 'description': 'Roof repair and installation'},
         ]
         
-        categories = []
-        for cat_data in categories_data:
-            cat, created = Category.objects.get_or_create(
-                name=cat_data['name'],
-                defaults={'description': cat_data['description']}
-            )
-            categories.append(cat)
-            if created:
-                self.stdout.write(self.style.SUCCESS(f'Created category: {cat.name}'))
+        # Fetch existing categories once and bulk insert only the missing ones
+        category_names = [d['name'] for d in categories_data]
+        existing_categories = set(
+            Category.objects.filter(name__in=category_names).values_list('name', flat=True)
+        )
+        new_categories = [Category(**d) for d in categories_data if d['name'] not in existing_categories]
+        Category.objects.bulk_create(new_categories)
+        for cat in new_categories:
+            self.stdout.write(self.style.SUCCESS(f'Created category: {cat.name}'))
 
         # Create sample providers (unclaimed listings)
         providers_data = [
@@ -137,51 +139,67 @@ class Command(BaseCommand):
             },
         ]
 
-        # Build category lookup dict
-        category_map = {cat.name: cat for cat in categories}
+        # Re-fetch so every category carries its primary key
+        category_map = {cat.name: cat for cat in Category.objects.filter(name__in=category_names)}
 
-        for prov_data in providers_data:
-            category = category_map[prov_data['category']]
-            # …rest of loop unchanged                        provider, created = Provider.objects.get_or_create(
+        # Only listings that do not exist yet get a provider, address and service
+        existing_providers = set(
+            Provider.objects.filter(
+                business_name__in=[d['business_name'] for d in providers_data]
+            ).values_list('business_name', flat=True)
+        )
+        new_providers_data = [d for d in providers_data if d['business_name'] not in existing_providers]
+        Provider.objects.bulk_create([
+            Provider(
                 business_name=prov_data['business_name'],
-            provider, created = Provider.objects.get_or_create(
-                business_name=prov_data['business_name'],
-                defaults={
-                    'description': prov_data['description'],
-                    'phone': prov_data['phone'],
-                    'email': prov_data['email'],
-                    'website': prov_data['website'],
-                    'is_active': True,
-                    'is_claimed': False,
-                }
+                description=prov_data['description'],
+                phone=prov_data['phone'],
+                email=prov_data['email'],
+                website=prov_data['website'],
+                is_active=True,
+                is_claimed=False,
             )
-            if created:                Address.objects.get_or_create(
-                    provider=provider,
-                    defaults={
-                        'street': address_data['street'],
-                        'city': address_data['city'],
-                        'state': address_data['state'],
-                        'postal_code': address_data['zipcode'],
-                        'country': 'USA',
-                        'latitude': Decimal(str(address_data['latitude'])),
-                        'longitude': Decimal(str(address_data['longitude'])),
-                        'is_primary': True
-                    }
-                )
-                
-                # Create services
-                Service.objects.get_or_create(
-                Service.objects.get_or_create(
-                    provider=provider,
-                    category=category,
-                    defaults={
-                        'name': f'{category.name} Services',
-                        'description': f'Professional {category.name.lower()} services',
-                        'price': Decimal('75.00'),
-                        'price_type': 'hourly',
-                        'is_active': True
-                    }
-                )                self.stdout.write(self.style.SUCCESS(f'Created provider: {provider.business_name}'))
+            for prov_data in new_providers_data
+        ])
+        provider_map = {
+            provider.business_name: provider
+            for provider in Provider.objects.filter(
+                business_name__in=[d['business_name'] for d in new_providers_data]
+            )
+        }
+
+        addresses = []
+        services = []
+        for prov_data in new_providers_data:
+            provider = provider_map[prov_data['business_name']]
+            category = category_map[prov_data['category']]
+            address_data = prov_data['address']
+            addresses.append(Address(
+                provider=provider,
+                street=address_data['street'],
+                city=address_data['city'],
+                state=address_data['state'],
+                postal_code=address_data['zipcode'],
+                country='USA',
+                latitude=Decimal(str(address_data['latitude'])),
+                longitude=Decimal(str(address_data['longitude'])),
+                is_primary=True
+            ))
+            services.append(Service(
+                provider=provider,
+                category=category,
+                name=f'{category.name} Services',
+                description=f'Professional {category.name.lower()} services',
+                price=Decimal('75.00'),
+                price_type='hourly',
+                is_active=True
+            ))
+        Address.objects.bulk_create(addresses)
+        Service.objects.bulk_create(services)
+
+        # Search vectors are filled in by database triggers as rows are inserted
+        for provider in provider_map.values():
+            self.stdout.write(self.style.SUCCESS(f'Created provider: {provider.business_name}'))
 
         self.stdout.write(self.style.SUCCESS('Sample data created successfully!'))
         self.stdout.write(f'Created {Category.objects.count()} categories')
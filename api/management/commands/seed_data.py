@@ -1,6 +1,16 @@
+import csv
+import io
+import multiprocessing
+import os
 import random
-from django.core.management.base import BaseCommand
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.hashers import make_password
+from django.db import DatabaseError, connection, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
 from faker import Faker
 from api.models import User, Provider, Address, Category, Service, Review
 from api.config import DataConfig, LocationConfig, BusinessConfig
@@ -29,6 +39,10 @@ INDIAN_CITIES = [
     {'name': 'Vadodara', 'state': 'Gujarat', 'lat': 22.3072, 'lng': 73.1812, 'pin': '390001'},
 ]
 
+# Username-safe city names, computed once instead of per generated username
+for _city in INDIAN_CITIES:
+    _city['slug'] = _city['name'].lower().replace('-', '').replace(' ', '')
+
 # Indian first names by region
 INDIAN_FIRST_NAMES = {
     'North': ['Raj', 'Priya', 'Amit', 'Neha', 'Vikram', 'Pooja', 'Rahul', 'Anita', 'Suresh', 'Kavita', 'Manoj', 'Sunita', 'Ajay', 'Meera', 'Ravi'],
@@ -45,23 +59,28 @@ INDIAN_LAST_NAMES = {
     'East': ['Banerjee', 'Mukherjee', 'Chatterjee', 'Ghosh', 'Roy', 'Das', 'Bose', 'Sen', 'Dutta', 'Chakraborty']
 }
 
-def get_region_for_state(state):
-    """Get region based on Indian state"""
-    north_states = ['Delhi', 'Punjab', 'Haryana', 'Uttar Pradesh', 'Uttarakhand', 'Himachal Pradesh', 'Jammu and Kashmir', 'Rajasthan']
-    south_states = ['Karnataka', 'Tamil Nadu', 'Andhra Pradesh', 'Telangana', 'Kerala']
-    west_states = ['Maharashtra', 'Gujarat', 'Goa', 'Madhya Pradesh']
-    east_states = ['West Bengal', 'Bihar', 'Jharkhand', 'Odisha', 'Assam']
-    
-    if state in north_states:
-        return 'North'
-    elif state in south_states:
-        return 'South'
-    elif state in west_states:
-        return 'West'
-    elif state in east_states:
-        return 'East'
-    else:
-        return 'North'  # Default
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.co.in', 'rediffmail.com', 'hotmail.com']
+
+# Name pools as NumPy arrays so each region's names are drawn in one call
+FIRST_NAMES = {region: np.array(names, dtype=object) for region, names in INDIAN_FIRST_NAMES.items()}
+LAST_NAMES = {region: np.array(names, dtype=object) for region, names in INDIAN_LAST_NAMES.items()}
+
+# Indian states by region
+REGION_STATES = {
+    'North': ['Delhi', 'Punjab', 'Haryana', 'Uttar Pradesh', 'Uttarakhand', 'Himachal Pradesh', 'Jammu and Kashmir', 'Rajasthan'],
+    'South': ['Karnataka', 'Tamil Nadu', 'Andhra Pradesh', 'Telangana', 'Kerala'],
+    'West': ['Maharashtra', 'Gujarat', 'Goa', 'Madhya Pradesh'],
+    'East': ['West Bengal', 'Bihar', 'Jharkhand', 'Odisha', 'Assam'],
+}
+# Unlisted states fall back to 'North' via STATE_TO_REGION.get(state, 'North')
+STATE_TO_REGION = {state: region for region, states in REGION_STATES.items() for state in states}
+
+# Lowercased names for usernames and emails
+LOWER_NAMES = {
+    name: name.lower()
+    for names in (*INDIAN_FIRST_NAMES.values(), *INDIAN_LAST_NAMES.values())
+    for name in names
+}
 
 # Regional business types and descriptions for Indian context
 REGIONAL_BUSINESSES = {
@@ -202,6 +221,271 @@ REGIONAL_BUSINESSES = {
     }
 }
 
+# Flattened lookups so the provider loop indexes tuples instead of
+# materializing dict keys per iteration
+REGIONAL_BUSINESS_TYPES = {region: tuple(types) for region, types in REGIONAL_BUSINESSES.items()}
+REGIONAL_BUSINESS_DESCS = {
+    (region, business_type): tuple(descs)
+    for region, types in REGIONAL_BUSINESSES.items()
+    for business_type, descs in types.items()
+}
+
+# Provider description building blocks by business type
+SPECIALIZATIONS = {
+    'Restaurant': ('vegetarian cuisine', 'non-vegetarian specialties', 'catering services', 'home delivery', 'party orders', 'traditional recipes', 'modern fusion', 'health-conscious meals'),
+    'Salon': ('hair cutting and styling', 'bridal makeup', 'facial treatments', 'hair spa services', 'manicure and pedicure', 'eyebrow threading', 'hair coloring', 'anti-aging treatments'),
+    'Electronics': ('mobile phone repair', 'laptop servicing', 'home appliance installation', 'warranty services', 'accessories sales', 'data recovery', 'screen replacement', 'software troubleshooting'),
+    'Tailoring': ('custom stitching', 'alteration services', 'designer wear', 'wedding outfits', 'formal suits', 'traditional wear', 'quick turnaround', 'fabric consultation'),
+    'Medical': ('general consultation', 'preventive care', 'emergency services', 'health checkups', 'prescription services', 'medical certificates', 'vaccination', 'chronic disease management')
+}
+
+CERTIFICATIONS = {
+    'Restaurant': ('FSSAI licensed', 'hygiene certified', 'ISO certified kitchen'),
+    'Salon': ('certified beautician', 'professional training completed', 'branded product expertise'),
+    'Electronics': ('authorized service center', 'technical certification', 'brand partnership'),
+    'Tailoring': ('fashion design diploma', 'tailoring certification', 'pattern making expertise'),
+    'Medical': ('MBBS qualified', 'registered practitioner', 'continuing education certified')
+}
+
+SERVICE_HIGHLIGHTS = {
+    'Restaurant': ('fresh ingredients daily', 'hygienic preparation', 'affordable pricing', 'quick service', 'customer satisfaction guaranteed'),
+    'Salon': ('experienced professionals', 'quality products used', 'clean and sanitized tools', 'personalized service', 'latest trends'),
+    'Electronics': ('genuine spare parts', 'warranty on repairs', 'quick diagnosis', 'affordable rates', 'doorstep service available'),
+    'Tailoring': ('perfect fitting guaranteed', 'quality fabric selection', 'timely delivery', 'reasonable pricing', 'latest fashion styles'),
+    'Medical': ('patient-centric care', 'modern equipment', 'affordable consultation', 'follow-up care', 'emergency availability')
+}
+
+DEFAULT_SPECIALIZATIONS = ('general services',)
+DEFAULT_CERTIFICATIONS = ('professionally qualified',)
+DEFAULT_HIGHLIGHTS = ('quality service',)
+
+# (pool, sample size) per business type, so the provider loop does one lookup
+SPECIALIZATION_SAMPLES = {bt: (pool, min(3, len(pool))) for bt, pool in SPECIALIZATIONS.items()}
+HIGHLIGHT_SAMPLES = {bt: (pool, min(3, len(pool))) for bt, pool in SERVICE_HIGHLIGHTS.items()}
+DEFAULT_SPECIALIZATION_SAMPLE = (DEFAULT_SPECIALIZATIONS, 1)
+DEFAULT_HIGHLIGHT_SAMPLE = (DEFAULT_HIGHLIGHTS, 1)
+
+PROVIDER_DESCRIPTION_TEMPLATE = (
+    "{base}\n\n"
+    "With {years} years of experience serving {city} and surrounding areas, "
+    "we are {certification} and committed to excellence. "
+    "Our specializations include: {specializations}.\n\n"
+    "Why choose us?\n"
+    "{highlights}\n"
+    "\nWe understand the local community needs and provide culturally appropriate services. "
+    "Customer satisfaction is our top priority, and we maintain the highest standards of quality and professionalism."
+)
+
+def build_provider_profile(row):
+    """
+    Build a provider's business name, description and website from pre-drawn inputs.
+
+    Kept at module level and free of shared state so --workers can run it in
+    child processes. The row's seed drives a private random.Random, so the
+    result does not depend on which process builds it.
+    """
+    (seed, first_name, last_name, username, city, region, years_in_business,
+     business_type_u, business_desc_u, bizname_idx, has_website) = row
+    rand = random.Random(seed)
+
+    # Get regional business type
+    business_types = REGIONAL_BUSINESS_TYPES[region]
+    business_type = business_types[int(business_type_u * len(business_types))]
+    business_descs = REGIONAL_BUSINESS_DESCS[region, business_type]
+    base_business_desc = business_descs[int(business_desc_u * len(business_descs))]
+
+    # Build comprehensive description
+    selected_specializations = rand.sample(*SPECIALIZATION_SAMPLES.get(business_type, DEFAULT_SPECIALIZATION_SAMPLE))
+    selected_certification = rand.choice(CERTIFICATIONS.get(business_type, DEFAULT_CERTIFICATIONS))
+    selected_highlights = rand.sample(*HIGHLIGHT_SAMPLES.get(business_type, DEFAULT_HIGHLIGHT_SAMPLE))
+
+    # Create detailed description with Indian context
+    description = PROVIDER_DESCRIPTION_TEMPLATE.format(
+        base=base_business_desc,
+        years=years_in_business,
+        city=city,
+        certification=selected_certification,
+        specializations=', '.join(selected_specializations),
+        highlights='\n'.join(f"• {highlight.capitalize()}" for highlight in selected_highlights),
+    )
+
+    # Generate Indian business names
+    business_name_options = [
+        f"{first_name} {business_type} Services",
+        f"Sri {first_name} {business_type}",
+        f"{last_name} & Sons {business_type}",
+        f"New {city} {business_type}",
+        f"{city} {business_type} Centre",
+        f"Modern {business_type} Solutions",
+        f"{first_name} Professional {business_type}",
+        f"Elite {business_type} by {first_name}"
+    ]
+
+    website = f"https://www.{username.replace('_', '')}.in" if has_website else ''
+    return business_name_options[bizname_idx], description, website
+
+# Indian cities with their coordinate bounds, for business addresses
+ADDRESS_CITIES = [
+    {'city': 'Mumbai', 'state': 'Maharashtra', 'lat_range': (19.0176, 19.2544), 'lng_range': (72.7831, 73.0648)},
+    {'city': 'Delhi', 'state': 'Delhi', 'lat_range': (28.4089, 28.8842), 'lng_range': (76.8380, 77.3466)},
+    {'city': 'Bangalore', 'state': 'Karnataka', 'lat_range': (12.8342, 13.1436), 'lng_range': (77.4601, 77.7840)},
+    {'city': 'Chennai', 'state': 'Tamil Nadu', 'lat_range': (12.8342, 13.2846), 'lng_range': (80.0955, 80.3242)},
+    {'city': 'Hyderabad', 'state': 'Telangana', 'lat_range': (17.2403, 17.5447), 'lng_range': (78.2579, 78.6677)},
+    {'city': 'Pune', 'state': 'Maharashtra', 'lat_range': (18.4088, 18.6298), 'lng_range': (73.7004, 73.9997)},
+    {'city': 'Kolkata', 'state': 'West Bengal', 'lat_range': (22.4697, 22.6757), 'lng_range': (88.2646, 88.4341)},
+    {'city': 'Ahmedabad', 'state': 'Gujarat', 'lat_range': (22.9734, 23.1644), 'lng_range': (72.4710, 72.6577)},
+    {'city': 'Jaipur', 'state': 'Rajasthan', 'lat_range': (26.8206, 27.0238), 'lng_range': (75.6897, 75.8648)},
+    {'city': 'Lucknow', 'state': 'Uttar Pradesh', 'lat_range': (26.7606, 26.9124), 'lng_range': (80.8776, 81.0594)},
+    {'city': 'Kochi', 'state': 'Kerala', 'lat_range': (9.8312, 10.0889), 'lng_range': (76.2144, 76.3212)},
+    {'city': 'Coimbatore', 'state': 'Tamil Nadu', 'lat_range': (10.9601, 11.0768), 'lng_range': (76.9211, 77.0624)},
+    {'city': 'Indore', 'state': 'Madhya Pradesh', 'lat_range': (22.6708, 22.7759), 'lng_range': (75.7333, 75.9063)},
+    {'city': 'Bhopal', 'state': 'Madhya Pradesh', 'lat_range': (23.1765, 23.3252), 'lng_range': (77.3200, 77.5134)},
+    {'city': 'Chandigarh', 'state': 'Punjab', 'lat_range': (30.6942, 30.7783), 'lng_range': (76.7344, 76.8094)},
+    {'city': 'Goa', 'state': 'Goa', 'lat_range': (15.2993, 15.5149), 'lng_range': (73.8278, 74.1240)},
+    {'city': 'Nagpur', 'state': 'Maharashtra', 'lat_range': (21.0846, 21.1936), 'lng_range': (78.9629, 79.1133)},
+    {'city': 'Thiruvananthapuram', 'state': 'Kerala', 'lat_range': (8.4855, 8.5478), 'lng_range': (76.9366, 77.0083)},
+    {'city': 'Vadodara', 'state': 'Gujarat', 'lat_range': (22.2736, 22.3649), 'lng_range': (73.1812, 73.2084)},
+    {'city': 'Surat', 'state': 'Gujarat', 'lat_range': (21.1458, 21.2514), 'lng_range': (72.7662, 72.8479)}
+]
+
+# Coordinate bounds as parallel arrays so addresses are sampled in one call
+ADDRESS_LAT_LO = np.array([c['lat_range'][0] for c in ADDRESS_CITIES])
+ADDRESS_LAT_HI = np.array([c['lat_range'][1] for c in ADDRESS_CITIES])
+ADDRESS_LNG_LO = np.array([c['lng_range'][0] for c in ADDRESS_CITIES])
+ADDRESS_LNG_HI = np.array([c['lng_range'][1] for c in ADDRESS_CITIES])
+
+STREET_PREFIXES = ['A-', 'B-', 'C-', '']
+BLOCK_LETTERS = ['A', 'B', 'C', 'D']
+AREAS = ['Nagar', 'Colony', 'Layout', 'Extension', 'Park', 'Road', 'Street']
+
+# Seeded review rating distribution
+REVIEW_RATINGS = [1, 2, 3, 4, 5]
+REVIEW_RATING_PROBS = [0.03, 0.07, 0.15, 0.40, 0.35]
+
+# Faker generators are slow; draw at most this many values per field and
+# sample from them
+FAKER_POOL_SIZE = 2000
+
+# Columns written for seeded addresses and services. Python-side defaults
+# (country, price_type, created_at, ...) have no database default, so every
+# column is supplied explicitly.
+ADDRESS_FIELDS = (
+    'provider_id', 'street', 'city', 'state', 'postal_code', 'country',
+    'latitude', 'longitude', 'is_primary',
+)
+SERVICE_FIELDS = (
+    'provider_id', 'category_id', 'name', 'description', 'price',
+    'price_type', 'is_active', 'created_at',
+)
+REVIEW_FIELDS = (
+    'user_id', 'provider_id', 'rating', 'comment', 'is_verified', 'status',
+    'reported_count', 'purchase_verified', 'created_at', 'updated_at',
+)
+
+# Rows buffered per COPY, bounding the in-memory CSV
+COPY_CHUNK_ROWS = 50000
+
+# Service and review rows buffered in Python before they are flushed to the
+# database, so memory stays flat however many rows are generated
+SEED_FLUSH_ROWS = 10000
+
+def seed_password(raw_password):
+    """
+    Hash a seed user's password with MD5 where the settings accept it.
+
+    Seeded accounts are throwaway test data, so skip PBKDF2's hundreds of
+    thousands of rounds. Falls back to the default hasher when
+    MD5PasswordHasher is not in PASSWORD_HASHERS (it is only added with DEBUG),
+    so seeded users can still log in.
+    """
+    try:
+        return make_password(raw_password, hasher='md5')
+    except ValueError:
+        return make_password(raw_password)
+
+def next_username_index(users):
+    """
+    One past the highest trailing _NNN index among the users' usernames.
+
+    Seeded usernames end in a zero-padded index. Counting users would give a
+    lower number once any seeded user is deleted, so the highest index in use
+    is read instead.
+    """
+    highest = -1
+    for username in users.values_list('username', flat=True).iterator():
+        head, _, index = username.rpartition('_')
+        if head and index.isdigit():
+            highest = max(highest, int(index))
+    return highest + 1
+
+def bulk_batch_size(model, batch_size):
+    """Cap a batch so one multi-row INSERT stays under PostgreSQL's 65535 bind parameters"""
+    return max(1, min(batch_size, 65535 // len(model._meta.concrete_fields)))
+
+def bulk_copy(model, fields, rows, batch_size, ignore_conflicts=False):
+    """
+    Load plain row tuples with PostgreSQL's COPY FROM STDIN, or executemany elsewhere.
+
+    COPY skips per-statement parameter parsing and planning, which dominates
+    multi-row INSERTs at seeding volumes, and the rows never become model
+    instances. Other backends (SQLite in development) run one prepared INSERT
+    through executemany, with values prepared by the model fields.
+    ``fields`` names the model field (or attname) for each tuple position.
+
+    With ignore_conflicts, rows that hit a unique constraint are skipped. COPY
+    has no conflict handling, so on PostgreSQL they land in a temporary
+    staging table first and move across with INSERT ... ON CONFLICT DO NOTHING.
+    """
+    if not rows:
+        return
+
+    ops = connection.ops
+    quote = ops.quote_name
+    model_fields = [model._meta.get_field(name) for name in fields]
+    table = quote(model._meta.db_table)
+    columns = ', '.join(quote(f.column) for f in model_fields)
+    on_conflict = OnConflict.IGNORE if ignore_conflicts else None
+    conflict_suffix = ops.on_conflict_suffix_sql(model_fields, on_conflict, None, None)
+
+    if connection.vendor != 'postgresql':
+        sql = (
+            f"{ops.insert_statement(on_conflict=on_conflict)} {table} ({columns}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))}) {conflict_suffix}"
+        )
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                cursor.executemany(sql, [
+                    [f.get_db_prep_save(value, connection) for f, value in zip(model_fields, row)]
+                    for row in rows[start:start + batch_size]
+                ])
+        return
+
+    with connection.cursor() as cursor:
+        target = table
+        if ignore_conflicts:
+            target = 'seed_staging'
+            cursor.execute(f"CREATE TEMP TABLE {target} AS SELECT {columns} FROM {table} WITH NO DATA")
+
+        for start in range(0, len(rows), COPY_CHUNK_ROWS):
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerows(
+                ['\\N' if value is None else value for value in row]
+                for row in rows[start:start + COPY_CHUNK_ROWS]
+            )
+            buf.seek(0)
+            cursor.copy_expert(
+                f"COPY {target} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buf
+            )
+
+        if ignore_conflicts:
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {target} {conflict_suffix}"
+            )
+            cursor.execute(f"DROP TABLE {target}")
+
+
 class Command(BaseCommand):
     help = f'Seeds the database with {DataConfig.NUM_PROVIDERS} providers and realistic data for performance testing'
 
@@ -223,23 +507,121 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=int(os.environ.get('SEED_BULK_BATCH_SIZE', 5000)),
+            help='Rows per INSERT for bulk creates (default: $SEED_BULK_BATCH_SIZE or 5000; capped per table)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes for building provider profiles (default: 1, 0 = one per CPU core; '
+                 'needs the fork start method)'
+        )
+        parser.add_argument(
+            '--with-passwords',
+            action='store_true',
+            help='Give seeded users the passwords provider123/customer123 '
+                 '(default: unusable passwords, no hashing)'
+        )
+
+    def drop_bulk_load_indexes(self, models):
+        """
+        Prepare PostgreSQL for a bulk load into the given models' tables.
+
+        Drops their secondary (non-unique, non-constraint) indexes so rows are
+        not indexed one at a time, and switches off foreign key triggers with
+        session_replication_role where the role is allowed to. Both are
+        transaction-local: a failed run rolls back to the original indexes.
+        Returns what restore_bulk_load_indexes needs to undo it.
+        """
+        if connection.vendor != 'postgresql':
+            return [], False
 
+        with connection.cursor() as cursor:
+            try:
+                # Savepoint: changing the role needs superuser on most installs
+                with transaction.atomic():
+                    cursor.execute("SET LOCAL session_replication_role = replica")
+                replica_role = True
+            except DatabaseError:
+                replica_role = False
+                self.stdout.write(self.style.WARNING(
+                    'Not allowed to set session_replication_role; foreign key checks stay on.'
+                ))
+
+            cursor.execute(
+                """
+                SELECT i.relname, pg_get_indexdef(ix.indexrelid)
+                FROM pg_index ix
+                JOIN pg_class i ON i.oid = ix.indexrelid
+                JOIN pg_class t ON t.oid = ix.indrelid
+                WHERE t.relname = ANY(%s)
+                  AND pg_table_is_visible(t.oid)
+                  AND NOT ix.indisunique
+                  AND NOT ix.indisprimary
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = ix.indexrelid)
+                """,
+                [[model._meta.db_table for model in models]]
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+
+        return [definition for _, definition in indexes], replica_role
+
+    def restore_bulk_load_indexes(self, index_definitions, replica_role):
+        """Rebuild the indexes dropped by drop_bulk_load_indexes and re-enable triggers"""
+        with connection.cursor() as cursor:
+            # Plain CREATE INDEX: CONCURRENTLY cannot run inside the seeding transaction
+            for definition in index_definitions:
+                cursor.execute(definition)
+            if replica_role:
+                cursor.execute("SET LOCAL session_replication_role = DEFAULT")
+
+    @transaction.atomic
     def handle(self, *args, **options):
         num_providers = options['providers']
         num_customers = options['customers']
+        batch_size = options['batch_size']
+        workers = options['workers'] or os.cpu_count()
+
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # Created rows are linked through the primary keys bulk_create sets
+            raise CommandError('seed_data needs a database that returns primary keys from bulk inserts '
+                               '(PostgreSQL, or SQLite 3.35+).')
         
         self.stdout.write(f'🚀 Preparing to seed {num_providers} providers and {num_customers} customers...')
+
+        # Draw the per-provider random decisions up front in a few vectorized
+        # calls; the loops below just index them. tolist() hands back plain
+        # Python ints/bools for the database adapters.
+        rng = np.random.default_rng()
+        city_idx = rng.integers(0, len(INDIAN_CITIES), size=num_providers).tolist()
+        email_domain_idx = rng.integers(0, len(EMAIL_DOMAINS), size=num_providers).tolist()
+        phone_tail = rng.integers(7_000_000_000, 10_000_000_000, size=num_providers).tolist()
+        years = rng.integers(2, 26, size=num_providers).tolist()
+        bizname_idx = rng.integers(0, 8, size=num_providers).tolist()
+        website_flag = rng.integers(0, 2, size=num_providers).astype(bool).tolist()
+        # Uniform draws scaled by each region's option count in the loop
+        business_type_u = rng.random(num_providers).tolist()
+        business_desc_u = rng.random(num_providers).tolist()
+        regions = [STATE_TO_REGION.get(INDIAN_CITIES[idx]['state'], 'North') for idx in city_idx]
+        # One draw per region sized to its provider count, consumed in order below
+        first_name_draws = {
+            region: iter(rng.choice(names, size=regions.count(region)).tolist())
+            for region, names in FIRST_NAMES.items()
+        }
+        last_name_draws = {
+            region: iter(rng.choice(names, size=regions.count(region)).tolist())
+            for region, names in LAST_NAMES.items()
+        }
         
         # Use multiple locales for diverse data
         fake = Faker(['en_US', 'en_GB', 'en_CA', 'en_AU'])
         
-        # Business type generators for realistic names
-        business_types = [
-            'Services', 'Solutions', 'Pro', 'Expert', 'Plus', 'Elite', 'Prime', 
-            'Express', 'Quick', 'Reliable', 'Professional', 'Quality', 'Best',
-            'Advanced', 'Superior', 'Premium', 'Specialist', 'Master', 'Tech'
-        ]
-        
         service_categories = [
             'Repair', 'Installation', 'Maintenance', 'Consultation', 'Design',
             'Emergency', 'Inspection', 'Cleaning', 'Upgrade', 'Custom'
@@ -256,6 +638,11 @@ class Command(BaseCommand):
             # Keep existing categories or create fresh ones
             Category.objects.all().delete()
 
+        # Indexed usernames continue after users from earlier runs so that
+        # seeding without --clear does not collide with them
+        provider_offset = next_username_index(User.objects.filter(role='provider'))
+        customer_offset = next_username_index(User.objects.filter(role='customer'))
+
         # --- Create Categories ---
         self.stdout.write('📂 Creating service categories...')
         categories_data = [
@@ -280,10 +667,20 @@ class Command(BaseCommand):
             )
             categories_to_create.append(category)
         
-        Category.objects.bulk_create(categories_to_create, ignore_conflicts=True)
+        # Existing categories keep their rows (no-op update on the name conflict)
+        Category.objects.bulk_create(
+            categories_to_create,
+            batch_size=bulk_batch_size(Category, batch_size),
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['name'],
+        )
+        # bulk_create does not set primary keys on upserted objects on every
+        # backend, so read the saved parents back in one query by name
+        main_names = [cat_data['name'] for cat_data in categories_data]
+        name_to_cat = Category.objects.in_bulk(main_names, field_name='name')
         
         # Create subcategories
-        main_categories = Category.objects.filter(parent_category__isnull=True)
         subcategories_data = {
             'Home Services': ['Plumbing', 'Electrical', 'HVAC', 'Landscaping', 'Cleaning', 'Painting'],
             'Professional Services': ['Legal', 'Accounting', 'Marketing', 'Consulting', 'Translation'],
@@ -298,234 +695,193 @@ class Command(BaseCommand):
         }
         
         subcategories_to_create = []
-        for main_cat in main_categories:
-            if main_cat.name in subcategories_data:
-                for sub_name in subcategories_data[main_cat.name]:
-                    subcategory = Category(
-                        name=sub_name,
-                        parent_category=main_cat,
-                        description=f"{sub_name} services under {main_cat.name}",
-                        is_active=True
-                    )
-                    subcategories_to_create.append(subcategory)
+        for main_name, sub_names in subcategories_data.items():
+            main_cat = name_to_cat[main_name]
+            for sub_name in sub_names:
+                subcategory = Category(
+                    name=sub_name,
+                    parent_category=main_cat,
+                    description=f"{sub_name} services under {main_cat.name}",
+                    is_active=True
+                )
+                subcategories_to_create.append(subcategory)
         
-        Category.objects.bulk_create(subcategories_to_create, ignore_conflicts=True)
+        Category.objects.bulk_create(subcategories_to_create, batch_size=bulk_batch_size(Category, batch_size), ignore_conflicts=True)
         all_categories = list(Category.objects.all())
 
+        if options['with_passwords']:
+            # Every seeded user of a role shares one password, so hash each once
+            provider_pw = seed_password('provider123')
+            customer_pw = seed_password('customer123')
+        else:
+            # Seeded users don't log in by default; one shared unusable
+            # password ('!' prefix) costs no hashing and still allows a reset
+            provider_pw = customer_pw = make_password(None)
+
         # --- Bulk Create Provider Users ---
         self.stdout.write(f'👥 Creating {num_providers} provider users with Indian names...')
-        provider_users_to_create = []
-        used_usernames = set()
+        # Lists are pre-sized and filled by index rather than grown by append
+        provider_users_to_create = [None] * num_providers
+        # City/region picked for each provider user, reused for its profile
+        provider_locations = [None] * num_providers
         
-        for _ in range(num_providers):
+        for i in range(num_providers):
             # Select random Indian city
-            city_data = random.choice(INDIAN_CITIES)
-            region = get_region_for_state(city_data['state'])
+            city_data = INDIAN_CITIES[city_idx[i]]
+            region = regions[i]
             
             # Generate Indian names based on region
-            first_name = random.choice(INDIAN_FIRST_NAMES[region])
-            last_name = random.choice(INDIAN_LAST_NAMES[region])
+            first_name = next(first_name_draws[region])
+            last_name = next(last_name_draws[region])
             
-            # Generate unique username
-            while True:
-                business_type = random.choice(business_types)
-                username = f"{first_name.lower()}_{last_name.lower()}_{city_data['name'].lower().replace('-', '').replace(' ', '')}_{random.randint(100, 999)}"
-                if username not in used_usernames and len(username) <= 150:
-                    used_usernames.add(username)
-                    break
+            lower_first = LOWER_NAMES[first_name]
+            lower_last = LOWER_NAMES[last_name]
+
+            # The loop counter makes usernames unique without a retry loop
+            username = f"{lower_first}_{lower_last}_{city_data['slug']}_{provider_offset + i:06d}"
             
             # Generate Indian phone number
-            indian_phone = f"+91-{random.randint(7000000000, 9999999999)}"
+            indian_phone = f"+91-{phone_tail[i]}"
             
             user = User(
                 username=username,
-                password=make_password('provider123'),
+                password=provider_pw,
                 first_name=first_name,
                 last_name=last_name,
-                email=f"{first_name.lower()}.{last_name.lower()}@{random.choice(['gmail.com', 'yahoo.co.in', 'rediffmail.com', 'hotmail.com'])}",
+                email=f"{lower_first}.{lower_last}@{EMAIL_DOMAINS[email_domain_idx[i]]}",
                 role='provider',
                 phone=indian_phone,
             )
-            provider_users_to_create.append(user)
+            provider_users_to_create[i] = user
+            provider_locations[i] = (city_data, region)
         
-        User.objects.bulk_create(provider_users_to_create, batch_size=100)
+        User.objects.bulk_create(provider_users_to_create, batch_size=bulk_batch_size(User, batch_size))
 
         # --- Bulk Create Customer Users ---
         self.stdout.write(f'👤 Creating {num_customers} customer users...')
-        customer_users_to_create = []
+        customer_users_to_create = [None] * num_customers
+        pool_size = min(num_customers, FAKER_POOL_SIZE)
+        first_pool = [fake.first_name() for _ in range(pool_size)]
+        last_pool = [fake.last_name() for _ in range(pool_size)]
+        phone_pool = [fake.phone_number()[:20] for _ in range(pool_size)]
+        first_idx = rng.integers(0, pool_size, size=num_customers).tolist()
+        last_idx = rng.integers(0, pool_size, size=num_customers).tolist()
+        phone_idx = rng.integers(0, pool_size, size=num_customers).tolist()
         
-        for _ in range(num_customers):
-            while True:
-                username = fake.unique.user_name()
-                if len(username) <= 150:  # Django username max length
-                    break
+        for i in range(num_customers):
+            # Indexed names are unique by construction, unlike fake.unique's retry loop
+            username = f"cust_{customer_offset + i:07d}"
             
             user = User(
                 username=username,
-                password=make_password('customer123'),
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                email=fake.unique.email(),
+                password=customer_pw,
+                first_name=first_pool[first_idx[i]],
+                last_name=last_pool[last_idx[i]],
+                email=f"{username}@example.com",
                 role='customer',
-                phone=fake.phone_number()[:20],
+                phone=phone_pool[phone_idx[i]],
             )
-            customer_users_to_create.append(user)
+            customer_users_to_create[i] = user
         
-        User.objects.bulk_create(customer_users_to_create, batch_size=100)
+        User.objects.bulk_create(customer_users_to_create, batch_size=bulk_batch_size(User, batch_size))
 
         # --- Bulk Create Providers ---
         self.stdout.write('🏢 Creating provider profiles with Indian businesses...')
-        provider_users = User.objects.filter(role='provider', is_superuser=False)
-        providers_to_create = []
+        providers_to_create = [None] * num_providers
         
-        for user in provider_users:
-            # Select random Indian city
-            city_data = random.choice(INDIAN_CITIES)
-            region = get_region_for_state(city_data['state'])
-            city = city_data['name']
-            
-            # Get regional business type
-            business_type = random.choice(list(REGIONAL_BUSINESSES[region].keys()))
-            base_business_desc = random.choice(REGIONAL_BUSINESSES[region][business_type])
-            
-            # Generate Indian business names
-            first_name = user.first_name
-            last_name = user.last_name
-            
-            # Create comprehensive provider description
-            years_in_business = random.randint(2, 25)
-            specializations = {
-                'Restaurant': ['vegetarian cuisine', 'non-vegetarian specialties', 'catering services', 'home delivery', 'party orders', 'traditional recipes', 'modern fusion', 'health-conscious meals'],
-                'Salon': ['hair cutting and styling', 'bridal makeup', 'facial treatments', 'hair spa services', 'manicure and pedicure', 'eyebrow threading', 'hair coloring', 'anti-aging treatments'],
-                'Electronics': ['mobile phone repair', 'laptop servicing', 'home appliance installation', 'warranty services', 'accessories sales', 'data recovery', 'screen replacement', 'software troubleshooting'],
-                'Tailoring': ['custom stitching', 'alteration services', 'designer wear', 'wedding outfits', 'formal suits', 'traditional wear', 'quick turnaround', 'fabric consultation'],
-                'Medical': ['general consultation', 'preventive care', 'emergency services', 'health checkups', 'prescription services', 'medical certificates', 'vaccination', 'chronic disease management']
-            }
-            
-            certifications = {
-                'Restaurant': ['FSSAI licensed', 'hygiene certified', 'ISO certified kitchen'],
-                'Salon': ['certified beautician', 'professional training completed', 'branded product expertise'],
-                'Electronics': ['authorized service center', 'technical certification', 'brand partnership'],
-                'Tailoring': ['fashion design diploma', 'tailoring certification', 'pattern making expertise'],
-                'Medical': ['MBBS qualified', 'registered practitioner', 'continuing education certified']
-            }
-            
-            service_highlights = {
-                'Restaurant': ['fresh ingredients daily', 'hygienic preparation', 'affordable pricing', 'quick service', 'customer satisfaction guaranteed'],
-                'Salon': ['experienced professionals', 'quality products used', 'clean and sanitized tools', 'personalized service', 'latest trends'],
-                'Electronics': ['genuine spare parts', 'warranty on repairs', 'quick diagnosis', 'affordable rates', 'doorstep service available'],
-                'Tailoring': ['perfect fitting guaranteed', 'quality fabric selection', 'timely delivery', 'reasonable pricing', 'latest fashion styles'],
-                'Medical': ['patient-centric care', 'modern equipment', 'affordable consultation', 'follow-up care', 'emergency availability']
-            }
-            
-            # Build comprehensive description
-            selected_specializations = random.sample(specializations.get(business_type, ['general services']), min(3, len(specializations.get(business_type, ['general services']))))
-            selected_certification = random.choice(certifications.get(business_type, ['professionally qualified']))
-            selected_highlights = random.sample(service_highlights.get(business_type, ['quality service']), min(3, len(service_highlights.get(business_type, ['quality service']))))
-            
-            # Create detailed description with Indian context
-            detailed_description = f"{base_business_desc}\n\n"
-            detailed_description += f"With {years_in_business} years of experience serving {city} and surrounding areas, "
-            detailed_description += f"we are {selected_certification} and committed to excellence. "
-            detailed_description += f"Our specializations include: {', '.join(selected_specializations)}.\n\n"
-            detailed_description += f"Why choose us?\n"
-            for i, highlight in enumerate(selected_highlights, 1):
-                detailed_description += f"• {highlight.capitalize()}\n"
-            detailed_description += f"\nWe understand the local community needs and provide culturally appropriate services. "
-            detailed_description += f"Customer satisfaction is our top priority, and we maintain the highest standards of quality and professionalism."
-            
-            business_name_options = [
-                f"{first_name} {business_type} Services",
-                f"Sri {first_name} {business_type}",
-                f"{last_name} & Sons {business_type}",
-                f"New {city} {business_type}",
-                f"{city} {business_type} Centre",
-                f"Modern {business_type} Solutions",
-                f"{first_name} Professional {business_type}",
-                f"Elite {business_type} by {first_name}"
-            ]
-            
+        # Profile text only depends on pre-drawn values, so it can be built in
+        # worker processes; each row carries its own seed for the sampled parts
+        profile_seeds = rng.integers(0, 2**32, size=num_providers).tolist()
+        profile_rows = [
+            (
+                profile_seeds[i], user.first_name, user.last_name, user.username,
+                city_data['name'], region, years[i], business_type_u[i], business_desc_u[i],
+                bizname_idx[i], website_flag[i],
+            )
+            for i, (user, (city_data, region)) in enumerate(zip(provider_users_to_create, provider_locations))
+        ]
+        if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            self.stdout.write(self.style.WARNING(
+                '--workers needs the fork start method; building profiles in this process'
+            ))
+            workers = 1
+        if workers > 1:
+            # Explicitly fork: spawned children would import api.models before
+            # Django is set up. Workers never touch the database.
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                profiles = pool.map(build_provider_profile, profile_rows, chunksize=1000)
+        else:
+            profiles = map(build_provider_profile, profile_rows)
+        
+        # bulk_create filled in the user primary keys, so no need to re-query them
+        for i, (user, (business_name, description, website)) in enumerate(zip(provider_users_to_create, profiles)):
             provider = Provider(
                 user=user,
-                business_name=random.choice(business_name_options),
-                description=detailed_description,
+                business_name=business_name,
+                description=description,
                 phone=user.phone,
                 email=user.email,
-                website=f"https://www.{user.username.replace('_', '')}.in" if random.choice([True, False]) else '',
+                website=website,
                 is_active=True
             )
-            providers_to_create.append(provider)
+            providers_to_create[i] = provider
         
-        Provider.objects.bulk_create(providers_to_create, batch_size=100)
+        # Index the provider, address and service tables once after loading
+        # instead of row by row
+        dropped_indexes, replica_role = self.drop_bulk_load_indexes([Provider, Address, Service])
+        Provider.objects.bulk_create(providers_to_create, batch_size=bulk_batch_size(Provider, batch_size))
 
         # --- Bulk Create Addresses ---
         self.stdout.write('📍 Creating business addresses...')
-        providers = Provider.objects.all()
-        addresses_to_create = []
-        
-        # Indian cities with their coordinates
-        indian_cities = [
-            {'city': 'Mumbai', 'state': 'Maharashtra', 'lat_range': (19.0176, 19.2544), 'lng_range': (72.7831, 73.0648)},
-            {'city': 'Delhi', 'state': 'Delhi', 'lat_range': (28.4089, 28.8842), 'lng_range': (76.8380, 77.3466)},
-            {'city': 'Bangalore', 'state': 'Karnataka', 'lat_range': (12.8342, 13.1436), 'lng_range': (77.4601, 77.7840)},
-            {'city': 'Chennai', 'state': 'Tamil Nadu', 'lat_range': (12.8342, 13.2846), 'lng_range': (80.0955, 80.3242)},
-            {'city': 'Hyderabad', 'state': 'Telangana', 'lat_range': (17.2403, 17.5447), 'lng_range': (78.2579, 78.6677)},
-            {'city': 'Pune', 'state': 'Maharashtra', 'lat_range': (18.4088, 18.6298), 'lng_range': (73.7004, 73.9997)},
-            {'city': 'Kolkata', 'state': 'West Bengal', 'lat_range': (22.4697, 22.6757), 'lng_range': (88.2646, 88.4341)},
-            {'city': 'Ahmedabad', 'state': 'Gujarat', 'lat_range': (22.9734, 23.1644), 'lng_range': (72.4710, 72.6577)},
-            {'city': 'Jaipur', 'state': 'Rajasthan', 'lat_range': (26.8206, 27.0238), 'lng_range': (75.6897, 75.8648)},
-            {'city': 'Lucknow', 'state': 'Uttar Pradesh', 'lat_range': (26.7606, 26.9124), 'lng_range': (80.8776, 81.0594)},
-            {'city': 'Kochi', 'state': 'Kerala', 'lat_range': (9.8312, 10.0889), 'lng_range': (76.2144, 76.3212)},
-            {'city': 'Coimbatore', 'state': 'Tamil Nadu', 'lat_range': (10.9601, 11.0768), 'lng_range': (76.9211, 77.0624)},
-            {'city': 'Indore', 'state': 'Madhya Pradesh', 'lat_range': (22.6708, 22.7759), 'lng_range': (75.7333, 75.9063)},
-            {'city': 'Bhopal', 'state': 'Madhya Pradesh', 'lat_range': (23.1765, 23.3252), 'lng_range': (77.3200, 77.5134)},
-            {'city': 'Chandigarh', 'state': 'Punjab', 'lat_range': (30.6942, 30.7783), 'lng_range': (76.7344, 76.8094)},
-            {'city': 'Goa', 'state': 'Goa', 'lat_range': (15.2993, 15.5149), 'lng_range': (73.8278, 74.1240)},
-            {'city': 'Nagpur', 'state': 'Maharashtra', 'lat_range': (21.0846, 21.1936), 'lng_range': (78.9629, 79.1133)},
-            {'city': 'Thiruvananthapuram', 'state': 'Kerala', 'lat_range': (8.4855, 8.5478), 'lng_range': (76.9366, 77.0083)},
-            {'city': 'Vadodara', 'state': 'Gujarat', 'lat_range': (22.2736, 22.3649), 'lng_range': (73.1812, 73.2084)},
-            {'city': 'Surat', 'state': 'Gujarat', 'lat_range': (21.1458, 21.2514), 'lng_range': (72.7662, 72.8479)}
+        n_addresses = len(providers_to_create)
+        address_city_idx = rng.integers(0, len(ADDRESS_CITIES), size=n_addresses)
+        lats = rng.uniform(ADDRESS_LAT_LO[address_city_idx], ADDRESS_LAT_HI[address_city_idx]).round(6).tolist()
+        lngs = rng.uniform(ADDRESS_LNG_LO[address_city_idx], ADDRESS_LNG_HI[address_city_idx]).round(6).tolist()
+        # Indian postal codes (6 digits)
+        postal_codes = rng.integers(100000, 1_000_000, size=n_addresses).astype(str).tolist()
+
+        # Generate Indian-style street lines: "<prefix><plot>[, <sector>] <street> <area>"
+        prefix_idx = rng.integers(0, len(STREET_PREFIXES), size=n_addresses).tolist()
+        plot_numbers = rng.integers(1, 1000, size=n_addresses).tolist()
+        has_sector = rng.integers(0, 2, size=n_addresses).astype(bool).tolist()
+        sector_kind = rng.integers(0, 3, size=n_addresses).tolist()
+        sector_numbers = rng.integers(1, 51, size=n_addresses).tolist()
+        block_idx = rng.integers(0, len(BLOCK_LETTERS), size=n_addresses).tolist()
+        area_idx = rng.integers(0, len(AREAS), size=n_addresses).tolist()
+        street_pool = [fake.street_name() for _ in range(min(n_addresses, FAKER_POOL_SIZE))]
+        street_idx = rng.integers(0, len(street_pool), size=n_addresses).tolist()
+        sectors = [
+            f"Sector {number}" if kind == 0 else f"Block {BLOCK_LETTERS[block]}" if kind == 1 else ''
+            for kind, number, block in zip(sector_kind, sector_numbers, block_idx)
         ]
-        
-        for provider in providers:
-            city_info = random.choice(indian_cities)
-            lat = round(random.uniform(city_info['lat_range'][0], city_info['lat_range'][1]), 6)
-            lng = round(random.uniform(city_info['lng_range'][0], city_info['lng_range'][1]), 6)
-            
-            # Generate Indian-style addresses
-            street_numbers = ['A-', 'B-', 'C-', '']
-            plot_numbers = random.randint(1, 999)
-            sectors = ['Sector ' + str(random.randint(1, 50)), 'Block ' + random.choice(['A', 'B', 'C', 'D']), '']
-            areas = ['Nagar', 'Colony', 'Layout', 'Extension', 'Park', 'Road', 'Street']
-            
-            street_name = f"{street_numbers[random.randint(0, len(street_numbers)-1)]}{plot_numbers}"
-            if random.choice([True, False]):
-                street_name += f", {random.choice(sectors)}"
-            street_name += f" {fake.street_name()} {random.choice(areas)}"
-            
-            # Indian postal codes (6 digits)
-            postal_code = f"{random.randint(100000, 999999)}"
-            
-            address = Address(
-                provider=provider,
-                street=street_name,
-                city=city_info['city'],
-                state=city_info['state'],
-                postal_code=postal_code,
-                country='India',
-                latitude=lat,
-                longitude=lng,
-                is_primary=True
+        streets = [
+            f"{STREET_PREFIXES[prefix]}{plot}"
+            + (f", {sector}" if sector_flag else '')
+            + f" {street_pool[street]} {AREAS[area]}"
+            for prefix, plot, sector_flag, sector, street, area
+            in zip(prefix_idx, plot_numbers, has_sector, sectors, street_idx, area_idx)
+        ]
+
+        # Plain tuples in ADDRESS_FIELDS order; no Address instances are built
+        address_rows = [
+            (
+                provider.pk, street, ADDRESS_CITIES[idx]['city'], ADDRESS_CITIES[idx]['state'],
+                postal_code, 'India', lat, lng, True,
             )
-            addresses_to_create.append(address)
+            for provider, idx, street, postal_code, lat, lng in zip(
+                providers_to_create, address_city_idx.tolist(), streets, postal_codes, lats, lngs
+            )
+        ]
         
-        Address.objects.bulk_create(addresses_to_create, batch_size=100)
+        bulk_copy(Address, ADDRESS_FIELDS, address_rows, batch_size)
 
         # --- Bulk Create Services ---
         self.stdout.write('🛠️ Creating services...')
-        services_to_create = []
+        service_rows = []
+        now = timezone.now()
+        description_pool = [fake.text(max_nb_chars=200) for _ in range(min(len(providers_to_create), FAKER_POOL_SIZE))]
         
-        for provider in providers:
+        for provider in providers_to_create:
             # Each provider gets 2-4 services
             num_services = random.randint(2, 4)
             provider_categories = random.sample(all_categories, min(num_services, len(all_categories)))
@@ -534,21 +890,33 @@ class Command(BaseCommand):
                 service_type = random.choice(service_categories)
                 base_name = category.name if category.name != 'Home Services' else random.choice(['General', 'Standard', 'Basic'])
                 
-                service = Service(
-                    provider=provider,
-                    name=f"{service_type} {base_name}",
-                    description=fake.text(max_nb_chars=200),
-                    category=category,
-                    price=round(random.uniform(25.0, 500.0), 2),
-                    is_active=True
-                )
-                services_to_create.append(service)
+                # Plain tuple in SERVICE_FIELDS order
+                service_rows.append((
+                    provider.pk,
+                    category.pk,
+                    f"{service_type} {base_name}",
+                    random.choice(description_pool),
+                    round(random.uniform(25.0, 500.0), 2),
+                    'quote',
+                    True,
+                    now,
+                ))
+            if len(service_rows) >= SEED_FLUSH_ROWS:
+                bulk_copy(Service, SERVICE_FIELDS, service_rows, batch_size)
+                service_rows.clear()
         
-        Service.objects.bulk_create(services_to_create, batch_size=200)
+        bulk_copy(Service, SERVICE_FIELDS, service_rows, batch_size)
+        if replica_role:
+            # The replica role also skips the search vector triggers; fill the
+            # vectors in one statement, before the GIN index is rebuilt
+            Provider.refresh_search_vectors([provider.pk for provider in providers_to_create])
+        self.restore_bulk_load_indexes(dropped_indexes, replica_role)
 
         # --- Bulk Create Reviews ---
         self.stdout.write('⭐ Creating customer reviews...')
-        customers = User.objects.filter(role='customer')
+        # Plain id lists: the loop only needs keys, not model instances
+        customer_ids = list(User.objects.filter(role='customer').values_list('id', flat=True))
+        provider_ids = [provider.pk for provider in providers_to_create]
         reviews_to_create = []
         
         # Enhanced Indian-context review comments
@@ -604,41 +972,58 @@ class Command(BaseCommand):
             "Not a good experience. Better options available in the area."
         ]
         
+        num_review_draws = min(DataConfig.NUM_REVIEWS, len(customer_ids) * len(provider_ids) // 8)  # Higher review ratio
+        # Weighted distribution: Indian markets tend to have more positive reviews.
+        # Ratings, verification flags and ages are drawn for every review up front.
+        rating_draws = rng.choice(REVIEW_RATINGS, size=num_review_draws, p=REVIEW_RATING_PROBS)
+        ratings = rating_draws.tolist()
+        # Comment pools indexed by rating - 1, with each review's position in
+        # its pool drawn up front
+        comment_pools = [poor_comments, poor_comments, average_comments, good_comments, excellent_comments]
+        pool_sizes = np.array([len(pool) for pool in comment_pools])
+        comment_idx = (rng.random(num_review_draws) * pool_sizes[rating_draws - 1]).astype(np.int64).tolist()
+        verified = (rng.random(num_review_draws) < 0.70).tolist()  # 70% verified reviews
+        # Review timing varies from 1 month to 2 years ago
+        days_ago = rng.integers(30, 731, size=num_review_draws).tolist()
+        review_now = timezone.now()
+        review_dates = [review_now - timedelta(days=d) for d in days_ago]
+        review_batch_size = bulk_batch_size(Review, batch_size)
+        
+        # Draw distinct (customer, provider) pairs in one call: sample flat indexes
+        # into the customer x provider grid without replacement, then split them,
+        # so there are no duplicates to reject
+        flat_pairs = rng.choice(len(customer_ids) * len(provider_ids), size=num_review_draws, replace=False)
+        customer_idx, provider_idx = np.divmod(flat_pairs, len(provider_ids))
+        
         # Create realistic review distribution (more positive reviews as typical in Indian markets)
-        for _ in range(min(DataConfig.NUM_REVIEWS, len(customers) * len(providers) // 8)):  # Higher review ratio
-            customer = random.choice(customers)
-            provider = random.choice(providers)
+        for i, (ci, pi) in enumerate(zip(customer_idx.tolist(), provider_idx.tolist())):
+            rating = ratings[i]
+            comment = comment_pools[rating - 1][comment_idx[i]]
+            review_date = review_dates[i]
             
-            # Avoid duplicate reviews (same customer, same provider)
-            if not any(r.provider == provider and r.user == customer for r in reviews_to_create):
-                # Weighted distribution: Indian markets tend to have more positive reviews
-                rating = random.choices([1, 2, 3, 4, 5], weights=[3, 7, 15, 40, 35])[0]
-                
-                if rating == 5:
-                    comment = random.choice(excellent_comments)
-                elif rating == 4:
-                    comment = random.choice(good_comments)
-                elif rating == 3:
-                    comment = random.choice(average_comments)
-                else:
-                    comment = random.choice(poor_comments)
-                
-                # Add some variation in review timing (from 1 month to 2 years ago)
-                from datetime import datetime, timedelta
-                days_ago = random.randint(30, 730)
-                review_date = datetime.now() - timedelta(days=days_ago)
-                
-                review = Review(
-                    user=customer,
-                    provider=provider,
-                    rating=rating,
-                    comment=comment,
-                    is_verified=random.choices([True, False], weights=[70, 30])[0],  # 70% verified reviews
-                    created_at=review_date
-                )
-                reviews_to_create.append(review)
+            # Plain tuple in REVIEW_FIELDS order. Written directly, so the
+            # backdated created_at is kept rather than replaced by auto_now_add.
+            reviews_to_create.append((
+                customer_ids[ci],
+                provider_ids[pi],
+                rating,
+                comment,
+                verified[i],
+                'pending',
+                0,
+                False,
+                review_date,
+                review_date,
+            ))
+            if len(reviews_to_create) >= SEED_FLUSH_ROWS:
+                # Pairs that already have a review (runs without --clear) are skipped
+                bulk_copy(Review, REVIEW_FIELDS, reviews_to_create, review_batch_size, ignore_conflicts=True)
+                reviews_to_create.clear()
         
-        Review.objects.bulk_create(reviews_to_create, batch_size=200, ignore_conflicts=True)
+        bulk_copy(Review, REVIEW_FIELDS, reviews_to_create, review_batch_size, ignore_conflicts=True)
+        # Reviews were written directly, without the signals that maintain
+        # provider review stats
+        Provider.refresh_review_stats(provider_ids)
 
         # --- Summary ---
         final_stats = {
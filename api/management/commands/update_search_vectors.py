@@ -8,7 +8,7 @@ Usage:
 """
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import connection
+from django.db import connection, transaction
 from django.utils.dateparse import parse_datetime
 from api.models import Provider
 
@@ -41,8 +41,8 @@ class Command(BaseCommand):
             )
             return
 
-        # Build queryset based on options
-        queryset = Provider.objects.filter(is_active=True)
+        # Build queryset based on options; only ids are needed
+        queryset = Provider.objects.filter(is_active=True).only('id')
         
         if options['provider_id']:
             queryset = queryset.filter(id=options['provider_id'])
@@ -67,19 +67,27 @@ class Command(BaseCommand):
         batch_size = options['batch_size']
         updated_count = 0
         
-        for i in range(0, total_count, batch_size):
-            batch = queryset[i:i + batch_size]
-            
-            for provider in batch:
-                try:
-                    provider.update_search_vector()
-                    updated_count += 1
-                    
-                    if updated_count % 50 == 0:
-                        self.stdout.write(f'  Updated {updated_count}/{total_count} providers...')
-                        
-                except Exception as e:
-                    self.stderr.write(f'Error updating provider {provider.id}: {e}')
+        # Keyset pagination: each batch seeks past the last id seen instead of
+        # re-scanning an ever-growing OFFSET
+        ids = queryset.order_by('id').values_list('id', flat=True)
+        last_id = 0
+        
+        while True:
+            batch_ids = list(ids.filter(id__gt=last_id)[:batch_size])
+            if not batch_ids:
+                break
+            last_id = batch_ids[-1]
+
+            try:
+                # One UPDATE per batch, each in its own transaction to keep
+                # lock and WAL footprint bounded
+                with transaction.atomic():
+                    updated_count += Provider.refresh_search_vectors(batch_ids)
+            except Exception as e:
+                self.stderr.write(f'Error updating providers {batch_ids[0]}-{batch_ids[-1]}: {e}')
+                continue
+
+            self.stdout.write(f'  Updated {updated_count}/{total_count} providers...')
 
         self.stdout.write(
             self.style.SUCCESS(f'Successfully updated search vectors for {updated_count} providers.')
@@ -0,0 +1,104 @@
+"""
+Index migration operations that build and drop indexes CONCURRENTLY on PostgreSQL.
+
+django.contrib.postgres's AddIndexConcurrently and RemoveIndexConcurrently
+fail on other backends, and SQLite is the default engine in development. These
+helpers keep the migration state change (AddIndex / RemoveIndex, or the
+AlterField that turns off a foreign key's db_index) separate from the database
+work, which runs CONCURRENTLY on PostgreSQL and as a plain CREATE / DROP INDEX
+elsewhere.
+
+Migrations using them must set ``atomic = False``: CONCURRENTLY cannot run
+inside a transaction.
+"""
+
+from django.db import migrations
+from django.db.models import Index
+
+
+def _add_index(schema_editor, model, index):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(model, index, concurrently=True)
+    else:
+        schema_editor.add_index(model, index)
+
+
+def _remove_index(schema_editor, model, index):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(model, index, concurrently=True)
+    else:
+        schema_editor.remove_index(model, index)
+
+
+def _field_index_names(schema_editor, model, field):
+    # The same lookup schema_editor.alter_field does when db_index goes away
+    return schema_editor._constraint_names(
+        model,
+        [field.column],
+        index=True,
+        type_=Index.suffix,
+        exclude={index.name for index in model._meta.indexes},
+    )
+
+
+def add_index_concurrently(model_name, index, app_label='api'):
+    """AddIndex, built with CREATE INDEX CONCURRENTLY on PostgreSQL"""
+    def forwards(apps, schema_editor):
+        _add_index(schema_editor, apps.get_model(app_label, model_name), index)
+
+    def backwards(apps, schema_editor):
+        _remove_index(schema_editor, apps.get_model(app_label, model_name), index)
+
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[migrations.AddIndex(model_name=model_name, index=index)],
+        database_operations=[migrations.RunPython(forwards, backwards)],
+    )
+
+
+def remove_index_concurrently(model_name, index, app_label='api'):
+    """
+    RemoveIndex, dropped with DROP INDEX CONCURRENTLY on PostgreSQL
+
+    Takes the full index definition, not just its name, so that reversing the
+    migration can rebuild it.
+    """
+    def forwards(apps, schema_editor):
+        _remove_index(schema_editor, apps.get_model(app_label, model_name), index)
+
+    def backwards(apps, schema_editor):
+        _add_index(schema_editor, apps.get_model(app_label, model_name), index)
+
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[migrations.RemoveIndex(model_name=model_name, name=index.name)],
+        database_operations=[migrations.RunPython(forwards, backwards)],
+    )
+
+
+def remove_field_index_concurrently(model_name, name, field, app_label='api'):
+    """
+    AlterField to a field with db_index=False, dropping its index CONCURRENTLY
+    on PostgreSQL
+
+    Takes the same arguments as the AlterField it replaces.
+    """
+    def forwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        concurrently = schema_editor.connection.vendor == 'postgresql'
+        for index_name in _field_index_names(schema_editor, model, model._meta.get_field(name)):
+            if concurrently:
+                schema_editor.execute(schema_editor._delete_index_sql(model, index_name, concurrently=True))
+            else:
+                schema_editor.execute(schema_editor._delete_index_sql(model, index_name))
+
+    def backwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        model_field = model._meta.get_field(name)
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[model_field], concurrently=True))
+        else:
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[model_field]))
+
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[migrations.AlterField(model_name=model_name, name=name, field=field)],
+        database_operations=[migrations.RunPython(forwards, backwards)],
+    )
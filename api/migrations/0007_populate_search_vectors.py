@@ -0,0 +1,65 @@
+# Data migration to populate search_vector for existing providers
+
+from django.db import migrations, transaction
+
+
+# Providers per UPDATE. Each range commits on its own so vacuum can keep up
+# and no single transaction holds row locks across the whole table.
+BATCH_SIZE = 10000
+
+# Aggregate active services once per provider and LEFT JOIN the result in,
+# instead of running correlated string_agg subqueries for every provider row.
+# Providers without active services still get their own fields indexed.
+POPULATE_RANGE_SQL = """
+    WITH svc AS (
+        SELECT provider_id,
+               string_agg(name, ' ') AS names,
+               string_agg(description, ' ') AS descs
+        FROM api_service
+        WHERE is_active = true AND provider_id >= %s AND provider_id < %s
+        GROUP BY provider_id
+    )
+    UPDATE api_provider p
+    SET search_vector =
+        setweight(to_tsvector('english', COALESCE(p.business_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(p.description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(svc.names, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(svc.descs, '')), 'C')
+    FROM api_provider p2
+    LEFT JOIN svc ON svc.provider_id = p2.id
+    WHERE p.id = p2.id AND p.id >= %s AND p.id < %s
+"""
+
+
+def populate_search_vectors(apps, schema_editor):
+    # tsvector functions are PostgreSQL only
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM api_provider")
+        min_id, max_id = cursor.fetchone()
+    if min_id is None:
+        return
+
+    for start in range(min_id, max_id + 1, BATCH_SIZE):
+        end = start + BATCH_SIZE
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            # Fail fast instead of queueing behind (and blocking) live traffic
+            cursor.execute("SET LOCAL lock_timeout = '5s'")
+            cursor.execute(POPULATE_RANGE_SQL, [start, end, start, end])
+
+
+class Migration(migrations.Migration):
+
+    # Batches commit individually instead of inside one migration transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0006_add_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
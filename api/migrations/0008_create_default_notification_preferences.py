@@ -0,0 +1,68 @@
+# Data migration to create default notification preferences for existing users
+
+import logging
+import os
+
+from django.db import migrations
+from django.db.models.constants import OnConflict
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFERENCE_FIELDS = (
+    'email_for_reviews', 'email_for_claims', 'email_for_messages',
+    'email_for_system', 'in_app_enabled',
+)
+
+
+def create_default_preferences(apps, schema_editor):
+    # Users created through bulk_create (e.g. seed_data) skip the post_save
+    # signal that normally creates their preferences
+    if os.environ.get('SKIP_HEAVY_MIGRATIONS'):
+        # The migration is still recorded as applied, so this won't rerun
+        logger.warning(
+            "SKIP_HEAVY_MIGRATIONS is set: notification preferences were not "
+            "backfilled. Run 'manage.py backfill_notification_preferences' to do it later."
+        )
+        return
+
+    User = apps.get_model('api', 'User')
+    NotificationPreference = apps.get_model('api', 'NotificationPreference')
+    # Fresh databases have nobody to backfill
+    if not User.objects.exists():
+        return
+
+    connection = schema_editor.connection
+    ops = connection.ops
+    quote = ops.quote_name
+    pref_table = quote(NotificationPreference._meta.db_table)
+    pref_user = quote(NotificationPreference._meta.get_field('user').column)
+    user_table = quote(User._meta.db_table)
+    user_pk = quote(User._meta.pk.column)
+    fields = [NotificationPreference._meta.get_field(name) for name in DEFAULT_PREFERENCE_FIELDS]
+    columns = ', '.join(quote(f.column) for f in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+
+    # One INSERT ... SELECT over the users without preferences; the rows never
+    # leave the database. The conflict clause keeps get_or_create semantics
+    # against the one-to-one constraint on every backend.
+    sql = (
+        f"{ops.insert_statement(on_conflict=OnConflict.IGNORE)} {pref_table} ({pref_user}, {columns}) "
+        f"SELECT u.{user_pk}, {placeholders} FROM {user_table} u "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {pref_table} np WHERE np.{pref_user} = u.{user_pk}) "
+        f"{ops.on_conflict_suffix_sql(fields, OnConflict.IGNORE, None, None)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [True] * len(fields))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_populate_search_vectors'),
+    ]
+
+    operations = [
+        # Only backfills existing rows, so squashing can drop it
+        migrations.RunPython(create_default_preferences, migrations.RunPython.noop, elidable=True),
+    ]
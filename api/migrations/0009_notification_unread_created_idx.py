@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:36
+
+from django.db import migrations, models
+from api.migration_operations import add_index_concurrently, remove_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0008_create_default_notification_preferences'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        remove_index_concurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read'], name='api_notific_user_id_16328d_idx'),
+        ),
+        add_index_concurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', '-created_at'], name='api_notif_unread_created_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:36
+
+"""
+Widen the (user, notification_type) index to (user, notification_type, is_read).
+
+Any index serves queries on its leftmost columns, so the wider index still
+covers the (user, notification_type) lookups and also answers per-type
+unread counts. Don't re-add the narrower index alongside it.
+"""
+
+from django.db import migrations, models
+from api.migration_operations import add_index_concurrently, remove_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0009_notification_unread_created_idx'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        remove_index_concurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', 'notification_type'], name='api_notific_user_id_5b04a6_idx'),
+        ),
+        add_index_concurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', 'notification_type', 'is_read'], name='api_notif_user_type_read_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:37
+
+from django.db import migrations, models
+from api.migration_operations import add_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0010_notification_user_type_read_idx'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        add_index_concurrently(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', '-created_at'], name='api_notif_unread_partial_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_notification_unread_partial_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userbehavior',
+            name='location_lat',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='userbehavior',
+            name='location_lng',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
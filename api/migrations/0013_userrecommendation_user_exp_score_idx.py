@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:37
+
+from django.db import migrations, models
+from api.migration_operations import add_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0012_userbehavior_float_location'),
+    ]
+
+    operations = [
+        add_index_concurrently(
+            model_name='userrecommendation',
+            index=models.Index(fields=['user', 'expires_at', '-score'], name='api_userrec_user_exp_score_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:38
+
+from django.db import migrations, models
+from api.migration_operations import remove_index_concurrently
+
+
+# Append-mostly timestamp columns whose values follow insertion order, so a
+# BRIN index (a few pages of per-block min/max summaries) replaces the B-tree
+BRIN_INDEXES = (
+    ('api_notification_created_brin', 'api_notification', 'created_at'),
+    ('api_userbehavior_created_brin', 'api_userbehavior', 'created_at'),
+    ('api_userrec_expires_brin', 'api_userrecommendation', 'expires_at'),
+)
+
+
+def create_brin_indexes(apps, schema_editor):
+    # BRIN is PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} "
+            f"USING BRIN ({column}) WITH (pages_per_range = 32)"
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in BRIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0013_userrecommendation_user_exp_score_idx'),
+    ]
+
+    operations = [
+        # BRIN indexes exist before the B-trees go, so range scans always have one
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+        remove_index_concurrently(
+            model_name='notification',
+            index=models.Index(fields=['created_at'], name='api_notific_created_238c70_idx'),
+        ),
+        remove_index_concurrently(
+            model_name='userbehavior',
+            index=models.Index(fields=['created_at'], name='api_userbeh_created_4ddcee_idx'),
+        ),
+        remove_index_concurrently(
+            model_name='userrecommendation',
+            index=models.Index(fields=['expires_at'], name='api_userrec_expires_24e999_idx'),
+        ),
+    ]
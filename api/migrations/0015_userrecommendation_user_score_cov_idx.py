@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:38
+
+from django.db import migrations, models
+from api.migration_operations import add_index_concurrently, remove_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0014_brin_timestamp_indexes'),
+    ]
+
+    operations = [
+        remove_index_concurrently(
+            model_name='userrecommendation',
+            index=models.Index(fields=['user', '-score'], name='api_userrec_user_id_80f46e_idx'),
+        ),
+        add_index_concurrently(
+            model_name='userrecommendation',
+            index=models.Index(fields=['user', '-score'], include=('provider',), name='api_userrec_user_score_cov_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:39
+
+from django.db import migrations, models
+from api.migration_operations import remove_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0015_userrecommendation_user_score_cov_idx'),
+    ]
+
+    operations = [
+        remove_index_concurrently(
+            model_name='userrecommendation',
+            index=models.Index(fields=['algorithm_version'], name='api_userrec_algorit_517adf_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Mark the (thread, created_at) index as the clustering index for messages
+
+from django.db import migrations
+
+
+def set_message_clustering_index(apps, schema_editor):
+    # PostgreSQL only. This just records the index; it does not rewrite the
+    # table, and it takes a lock that doesn't block reads or writes.
+    #
+    # The CLUSTER that physically orders a thread's messages onto adjacent
+    # pages holds an ACCESS EXCLUSIVE lock for the whole rewrite, so it is
+    # not run on deploy. Run "manage.py cluster_messages" in a maintenance
+    # window (or use pg_repack) instead.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("ALTER TABLE api_message CLUSTER ON api_message_thread__045a22_idx")
+
+
+def unset_message_clustering_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("ALTER TABLE api_message SET WITHOUT CLUSTER")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_remove_userrecommendation_algorithm_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_message_clustering_index, unset_message_clustering_index),
+    ]
@@ -0,0 +1,33 @@
+# Cache notification ids per connection to ease sequence contention
+
+from django.db import migrations
+
+
+# Ids each connection reserves from the sequence at a time. Unused ids are
+# lost when a connection closes, so ids stay unique and increasing per
+# connection but may have gaps.
+SEQUENCE_CACHE = 1000
+
+
+def set_sequence_cache(cache):
+    def operation(apps, schema_editor):
+        # Sequence caching is a PostgreSQL setting
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT pg_get_serial_sequence('api_notification', 'id')")
+            sequence, = cursor.fetchone()
+            if sequence:
+                cursor.execute(f"ALTER SEQUENCE {sequence} CACHE {int(cache)}")
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_cluster_messages_by_thread'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_sequence_cache(SEQUENCE_CACHE), set_sequence_cache(1)),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from api.migration_operations import remove_index_concurrently, remove_field_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0018_notification_id_sequence_cache'),
+    ]
+
+    operations = [
+        remove_index_concurrently(
+            model_name='abtestvariant',
+            index=models.Index(fields=['user', 'experiment_name'], name='api_abtestv_user_id_e8dfe4_idx'),
+        ),
+        remove_field_index_concurrently(
+            model_name='abtestvariant',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        remove_field_index_concurrently(
+            model_name='notification',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL),
+        ),
+        remove_field_index_concurrently(
+            model_name='userrecommendation',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:40
+
+from django.db import migrations, models
+from api.migration_operations import remove_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0019_drop_redundant_user_indexes'),
+    ]
+
+    operations = [
+        remove_index_concurrently(
+            model_name='userbehavior',
+            index=models.Index(fields=['session_id'], name='api_userbeh_session_f6fba4_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from api.migration_operations import add_index_concurrently, remove_field_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0020_remove_userbehavior_session_idx'),
+    ]
+
+    operations = [
+        # New indexes first, so participant lookups are never left unindexed
+        add_index_concurrently(
+            model_name='messagethread',
+            index=models.Index(fields=['customer', '-updated_at'], name='api_thread_cust_upd_idx'),
+        ),
+        add_index_concurrently(
+            model_name='messagethread',
+            index=models.Index(fields=['provider', '-updated_at'], name='api_thread_prov_upd_idx'),
+        ),
+        remove_field_index_concurrently(
+            model_name='messagethread',
+            name='customer',
+            field=models.ForeignKey(db_index=False, limit_choices_to={'role': 'customer'}, on_delete=django.db.models.deletion.CASCADE, related_name='customer_threads', to=settings.AUTH_USER_MODEL),
+        ),
+        remove_field_index_concurrently(
+            model_name='messagethread',
+            name='provider',
+            field=models.ForeignKey(db_index=False, limit_choices_to={'role': 'provider'}, on_delete=django.db.models.deletion.CASCADE, related_name='provider_threads', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,137 @@
+# Maintain Provider.search_vector with database triggers instead of save() hooks
+
+from django.db import migrations
+
+
+# Provider rows get their vector computed in place before they are written,
+# so saving a provider costs no extra statement. Weights match
+# Provider.refresh_search_vectors().
+PROVIDER_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION api_provider_search_vector() RETURNS trigger AS $$
+    BEGIN
+        SELECT setweight(to_tsvector('english', COALESCE(NEW.business_name, '')), 'A') ||
+               setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'B') ||
+               setweight(to_tsvector('english', COALESCE(svc.names, '')), 'A') ||
+               setweight(to_tsvector('english', COALESCE(svc.descs, '')), 'C')
+        INTO NEW.search_vector
+        FROM (
+            SELECT string_agg(name, ' ') AS names, string_agg(description, ' ') AS descs
+            FROM api_service
+            WHERE provider_id = NEW.id AND is_active = true
+        ) svc;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+# Service changes refresh their providers once per statement, using the
+# transition tables, so a bulk insert of services is one UPDATE rather than
+# one per row
+SERVICE_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION api_service_search_vector() RETURNS trigger AS $$
+    DECLARE
+        ids bigint[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(DISTINCT provider_id) INTO ids FROM new_rows;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT array_agg(DISTINCT provider_id) INTO ids FROM old_rows;
+        ELSE
+            SELECT array_agg(provider_id) INTO ids FROM (
+                SELECT provider_id FROM new_rows
+                UNION
+                SELECT provider_id FROM old_rows
+            ) changed;
+        END IF;
+
+        IF ids IS NULL THEN
+            RETURN NULL;
+        END IF;
+
+        WITH svc AS (
+            SELECT provider_id,
+                   string_agg(name, ' ') AS names,
+                   string_agg(description, ' ') AS descs
+            FROM api_service
+            WHERE is_active = true AND provider_id = ANY(ids)
+            GROUP BY provider_id
+        )
+        UPDATE api_provider p
+        SET search_vector =
+            setweight(to_tsvector('english', COALESCE(p.business_name, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(p.description, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(svc.names, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(svc.descs, '')), 'C')
+        FROM api_provider p2
+        LEFT JOIN svc ON svc.provider_id = p2.id
+        WHERE p.id = p2.id AND p.id = ANY(ids);
+
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+CREATE_TRIGGERS_SQL = (
+    PROVIDER_FUNCTION_SQL,
+    SERVICE_FUNCTION_SQL,
+    # The service trigger only sets search_vector, so it does not re-fire this one
+    """
+    CREATE TRIGGER api_provider_search_vector
+    BEFORE INSERT OR UPDATE OF business_name, description ON api_provider
+    FOR EACH ROW EXECUTE FUNCTION api_provider_search_vector()
+    """,
+    # Transition tables allow only one event per trigger
+    """
+    CREATE TRIGGER api_service_search_vector_insert
+    AFTER INSERT ON api_service
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_service_search_vector()
+    """,
+    """
+    CREATE TRIGGER api_service_search_vector_update
+    AFTER UPDATE ON api_service
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_service_search_vector()
+    """,
+    """
+    CREATE TRIGGER api_service_search_vector_delete
+    AFTER DELETE ON api_service
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_service_search_vector()
+    """,
+)
+
+DROP_TRIGGERS_SQL = (
+    "DROP TRIGGER IF EXISTS api_service_search_vector_delete ON api_service",
+    "DROP TRIGGER IF EXISTS api_service_search_vector_update ON api_service",
+    "DROP TRIGGER IF EXISTS api_service_search_vector_insert ON api_service",
+    "DROP TRIGGER IF EXISTS api_provider_search_vector ON api_provider",
+    "DROP FUNCTION IF EXISTS api_service_search_vector()",
+    "DROP FUNCTION IF EXISTS api_provider_search_vector()",
+)
+
+
+def create_triggers(apps, schema_editor):
+    # Triggers and tsvector functions are PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in CREATE_TRIGGERS_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_TRIGGERS_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_messagethread_participant_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
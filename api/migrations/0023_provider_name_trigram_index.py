@@ -0,0 +1,39 @@
+# Trigram index so business name substring searches can use an index
+
+from django.db import migrations
+
+
+# Django runs icontains on PostgreSQL as UPPER(column::text) LIKE UPPER(...),
+# so the index is on the same expression. pg_trgm is enabled by 0006.
+CREATE_INDEX_SQL = """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS api_provider_name_trgm_idx
+    ON api_provider USING GIN (UPPER(business_name::text) gin_trgm_ops)
+"""
+DROP_INDEX_SQL = "DROP INDEX CONCURRENTLY IF EXISTS api_provider_name_trgm_idx"
+
+
+def create_index(apps, schema_editor):
+    # Trigram indexes are PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_INDEX_SQL)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_INDEX_SQL)
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0022_search_vector_triggers'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
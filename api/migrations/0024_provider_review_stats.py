@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:45
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_stats(apps, schema_editor):
+    # Same aggregation as Provider.refresh_review_stats(), one UPDATE for all
+    # providers
+    Provider = apps.get_model('api', 'Provider')
+    Review = apps.get_model('api', 'Review')
+    reviews = Review.objects.filter(provider=OuterRef('pk')).order_by().values('provider')
+    Provider.objects.update(
+        reviews_count=Coalesce(Subquery(reviews.annotate(n=Count('pk')).values('n')), 0),
+        rating_avg=Subquery(reviews.annotate(avg=Avg('rating')).values('avg')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_provider_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='provider',
+            name='rating_avg',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='provider',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        # Only backfills existing rows, so squashing can drop it
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop, elidable=True),
+    ]
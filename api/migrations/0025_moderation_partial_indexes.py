@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:46
+
+from django.db import migrations, models
+from api.migration_operations import add_index_concurrently, remove_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped CONCURRENTLY, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0024_provider_review_stats'),
+    ]
+
+    operations = [
+        add_index_concurrently(
+            model_name='claim',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'under_review'])), fields=['status', '-created_at'], name='api_claim_open_idx'),
+        ),
+        add_index_concurrently(
+            model_name='review',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'flagged'])), fields=['status', '-created_at'], name='api_review_pending_idx'),
+        ),
+        add_index_concurrently(
+            model_name='reviewreport',
+            index=models.Index(condition=models.Q(('resolved', False)), fields=['-created_at'], name='api_report_unresolved_idx'),
+        ),
+        # The full-table indexes go once the partial ones exist
+        remove_index_concurrently(
+            model_name='review',
+            index=models.Index(fields=['status'], name='api_review_status_238803_idx'),
+        ),
+        remove_index_concurrently(
+            model_name='reviewreport',
+            index=models.Index(fields=['resolved'], name='api_reviewr_resolve_5071f0_idx'),
+        ),
+    ]
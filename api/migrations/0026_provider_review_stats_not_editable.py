@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_moderation_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='provider',
+            name='rating_avg',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='provider',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,9 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
-from django.db.models import Avg
+from django.db.models import Avg, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
@@ -27,6 +28,39 @@ HAS_GIS = False
 # except ImportError:
 #     HAS_GIS = False
 
+# Provider columns maintained from the reviews table, never by Provider.save()
+REVIEW_STAT_FIELDS = ('reviews_count', 'rating_avg')
+
+# Providers per UPDATE in Provider.refresh_review_stats(), keeping the IN list
+# well under SQLite's bound parameter limit
+REVIEW_STATS_BATCH_SIZE = 500
+
+# Expired recommendations removed per DELETE in UserRecommendation.purge_expired()
+PURGE_BATCH_SIZE = 10000
+
+# Search vectors for a batch of providers in one statement. Services are
+# aggregated once per provider in the CTE and LEFT JOINed, so providers without
+# active services still get their own fields indexed.
+SEARCH_VECTOR_BATCH_SQL = """
+    WITH svc AS (
+        SELECT provider_id,
+               string_agg(name, ' ') AS names,
+               string_agg(description, ' ') AS descs
+        FROM api_service
+        WHERE is_active = true AND provider_id = ANY(%s)
+        GROUP BY provider_id
+    )
+    UPDATE api_provider p
+    SET search_vector =
+        setweight(to_tsvector('english', COALESCE(p.business_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(p.description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(svc.names, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(svc.descs, '')), 'C')
+    FROM api_provider p2
+    LEFT JOIN svc ON svc.provider_id = p2.id
+    WHERE p.id = p2.id AND p.id = ANY(%s)
+"""
+
 # It's best practice to use a custom user model from the start
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -85,53 +119,77 @@ class Provider(models.Model):
     is_verified = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_claimed = models.BooleanField(default=False)  # Default False for new providers (unclaimed)
+    # Review aggregates kept on the row so listings don't count reviews per
+    # provider. Review signals adjust them; bulk loads call refresh_review_stats().
+    # Not editable, and left out of ordinary saves (see save()).
+    reviews_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_avg = models.FloatField(null=True, blank=True, editable=False)
 
     # Add SearchVectorField for full-text search (conditional on PostgreSQL)
-    # This field will be maintained automatically via save() method
-    # In production with PostgreSQL, a GIN index should be added for performance
-    
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update search vector if PostgreSQL is available
-        if HAS_POSTGRES and hasattr(self, 'search_vector'):
-            self.update_search_vector()
-
-    def update_search_vector(self):
-        """Update the search vector for this provider (PostgreSQL only)"""
-        if not HAS_POSTGRES or not hasattr(self, 'search_vector'):
-            return
-            
+    # On PostgreSQL the field is maintained by database triggers on api_provider
+    # and api_service (migration 0022) and has a GIN index (migration 0006)
+    # business_name icontains lookups use a trigram GIN index on PostgreSQL
+    # (migration 0023)
+
+    @classmethod
+    def refresh_search_vectors(cls, provider_ids):
+        """
+        Recompute search vectors for many providers in one UPDATE (PostgreSQL only).
+
+        Triggers keep vectors current on every write; this rebuilds them after
+        loads that bypass triggers (session_replication_role = replica).
+        Returns the number of providers updated.
+        """
         from django.db import connection
-        if connection.vendor == 'postgresql':
-            # Use raw SQL for efficient search vector update including services
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE api_provider 
-                    SET search_vector = 
-                        setweight(to_tsvector('english', COALESCE(business_name, '')), 'A') ||
-                        setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
-                        setweight(to_tsvector('english', COALESCE(
-                            (SELECT string_agg(s.name, ' ') 
-                             FROM api_service s 
-                             WHERE s.provider_id = %s AND s.is_active = true), '')), 'A') ||
-                        setweight(to_tsvector('english', COALESCE(
-                            (SELECT string_agg(s.description, ' ') 
-                             FROM api_service s 
-                             WHERE s.provider_id = %s AND s.is_active = true), '')), 'C')
-                    WHERE id = %s
-                """, [self.pk, self.pk, self.pk])
+        if not HAS_POSTGRES or connection.vendor != 'postgresql' or not provider_ids:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(SEARCH_VECTOR_BATCH_SQL, [list(provider_ids), list(provider_ids)])
+            return cursor.rowcount
+
+    @classmethod
+    def refresh_review_stats(cls, provider_ids=None):
+        """
+        Recompute reviews_count and rating_avg from the reviews table.
+
+        For writes that bypass the Review signals (bulk_create, COPY, raw SQL).
+        Covers every provider when provider_ids is None. Returns the number of
+        providers updated.
+        """
+        reviews = Review.objects.filter(provider=OuterRef('pk')).order_by().values('provider')
+        stats = {
+            'reviews_count': Coalesce(Subquery(reviews.annotate(n=Count('pk')).values('n')), 0),
+            'rating_avg': Subquery(reviews.annotate(avg=Avg('rating')).values('avg')),
+        }
+        if provider_ids is None:
+            return cls.objects.update(**stats)
+        provider_ids = list(provider_ids)
+        updated = 0
+        for start in range(0, len(provider_ids), REVIEW_STATS_BATCH_SIZE):
+            batch = provider_ids[start:start + REVIEW_STATS_BATCH_SIZE]
+            updated += cls.objects.filter(pk__in=batch).update(**stats)
+        return updated
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # The review stats are changed in the database by the Review signals.
+        # A plain save() of an instance loaded earlier would write its stale
+        # copy back over them, so only an explicit update_fields writes them.
+        # Everything else save() does (deferred fields, re-inserting a deleted
+        # row) is left to Django.
+        if update_fields is None:
+            values = [value for value in values if value[0].name not in REVIEW_STAT_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
 
     def __str__(self):
         return self.business_name
         
     @property
     def average_rating(self):
-        avg = self.reviews.aggregate(Avg('rating'))['rating__avg']
-        return round(avg, 1) if avg else None
+        return round(self.rating_avg, 1) if self.rating_avg else None
         
     @property
     def review_count(self):
-        return self.reviews.count()
+        return self.reviews_count
 
 # Conditionally add SearchVectorField for PostgreSQL after model definition
 # Note: This field is also added to migrations (0007_add_search_vector_postgresql.py)
@@ -186,6 +244,14 @@ class Claim(models.Model):
                 name='unique_active_claim_per_user_provider'
             )
         ]
+        indexes = [
+            # Claims still awaiting a decision
+            models.Index(
+                fields=['status', '-created_at'],
+                condition=models.Q(status__in=['pending', 'under_review']),
+                name='api_claim_open_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Claim for {self.provider.business_name} by {self.claimant.username}"
@@ -247,19 +313,6 @@ class Service(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update provider's search vector when service changes
-        if hasattr(self.provider, 'update_search_vector'):
-            self.provider.update_search_vector()
-
-    def delete(self, *args, **kwargs):
-        provider = self.provider
-        super().delete(*args, **kwargs)
-        # Update provider's search vector when service is deleted
-        if hasattr(provider, 'update_search_vector'):
-            provider.update_search_vector()
-
     def __str__(self):
         return f"{self.name} by {self.provider.business_name}"
 
@@ -355,6 +408,43 @@ class Availability(models.Model):
     def __str__(self):
         return f"{self.provider.business_name} - {self.get_day_of_week_display()}: {self.start_time}-{self.end_time}"
 
+class ReviewQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Update reviews and recompute the stats of every provider involved.
+
+        Queryset updates (and bulk_update, which runs through here) skip the
+        Review signals that keep Provider.reviews_count and rating_avg
+        current, so a change of rating or provider refreshes them afterwards.
+        """
+        if 'rating' not in kwargs and 'provider' not in kwargs and 'provider_id' not in kwargs:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            affected = list(self.order_by().values_list('pk', 'provider_id'))
+            rows = super().update(**kwargs)
+            provider_ids = {provider_id for _, provider_id in affected}
+            if 'provider' in kwargs or 'provider_id' in kwargs:
+                # Read back where the moved reviews point now
+                provider_ids.update(
+                    Review.objects.filter(pk__in=[pk for pk, _ in affected]).values_list('provider_id', flat=True)
+                )
+            Provider.refresh_review_stats(provider_ids)
+        return rows
+
+    def delete(self):
+        """
+        Delete reviews and recompute the stats of the providers they belonged to.
+
+        There is no post_delete receiver for Review: it would stop cascades
+        from deleting reviews in bulk.
+        """
+        with transaction.atomic(using=self.db):
+            provider_ids = set(self.order_by().values_list('provider_id', flat=True))
+            result = super().delete()
+            Provider.refresh_review_stats(provider_ids)
+        return result
+
+
 class Review(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending Review'),
@@ -363,6 +453,8 @@ class Review(models.Model):
         ('flagged', 'Flagged for Review')
     ]
     
+    objects = ReviewQuerySet.as_manager()
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews')
     provider = models.ForeignKey(Provider, on_delete=models.CASCADE, related_name='reviews')
     # Enables community ratings and reviews
@@ -402,7 +494,12 @@ class Review(models.Model):
         unique_together = ('user', 'provider')
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['status']),
+            # Moderation queue only; approved and rejected reviews stay out of it
+            models.Index(
+                fields=['status', '-created_at'],
+                condition=models.Q(status__in=['pending', 'flagged']),
+                name='api_review_pending_idx',
+            ),
             models.Index(fields=['reported_count']),
             models.Index(fields=['purchase_verified']),
         ]
@@ -410,6 +507,13 @@ class Review(models.Model):
     def __str__(self):
         return f"Review by {self.user.username} for {self.provider.business_name}"
 
+    def delete(self, *args, **kwargs):
+        # Not called when a review goes in a cascade; see ReviewQuerySet.delete
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Provider.refresh_review_stats([self.provider_id])
+        return result
+
     def report(self):
         """Increment the reported_count and set status to flagged if threshold reached"""
         self.reported_count += 1
@@ -454,7 +558,12 @@ class ReviewReport(models.Model):
         unique_together = ('review', 'reporter')  # Prevent duplicate reports
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['resolved']),
+            # Open reports only; resolved ones are never listed by status
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(resolved=False),
+                name='api_report_unresolved_idx',
+            ),
             models.Index(fields=['reason']),
         ]
 
@@ -529,8 +638,10 @@ class UserBehavior(models.Model):
     provider = models.ForeignKey('Provider', on_delete=models.CASCADE, null=True, blank=True)
     search_query = models.TextField(null=True, blank=True)
     category = models.ForeignKey('Category', on_delete=models.SET_NULL, null=True, blank=True)
-    location_lat = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
-    location_lng = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
+    # Doubles rather than numeric: fixed width on disk and plain floats for
+    # the recommendation maths, with no Decimal per row
+    location_lat = models.FloatField(null=True, blank=True)
+    location_lng = models.FloatField(null=True, blank=True)
     session_id = models.CharField(max_length=40, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -538,9 +649,10 @@ class UserBehavior(models.Model):
         db_table = 'api_userbehavior'
         indexes = [
             models.Index(fields=['user', 'action_type']),
-            models.Index(fields=['created_at']),
+            # created_at has a BRIN index on PostgreSQL (migration 0014) instead of a B-tree
             models.Index(fields=['provider']),
-            models.Index(fields=['session_id']),
+            # session_id is recorded for analysis but never filtered on, so it
+            # is not indexed
         ]
         ordering = ['-created_at']
     
@@ -549,7 +661,9 @@ class UserBehavior(models.Model):
 
 
 class UserRecommendation(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # No index of its own: the unique (user, provider) constraint and both
+    # composite indexes lead on user
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     provider = models.ForeignKey('Provider', on_delete=models.CASCADE)
     score = models.FloatField()
     algorithm_version = models.CharField(max_length=50, default='v1.0')
@@ -560,9 +674,13 @@ class UserRecommendation(models.Model):
         db_table = 'api_userrecommendation'
         unique_together = ['user', 'provider']
         indexes = [
-            models.Index(fields=['user', '-score']),
-            models.Index(fields=['expires_at']),
-            models.Index(fields=['algorithm_version']),
+            # Carries provider_id so top-N reads of (provider, score) are index-only
+            models.Index(fields=['user', '-score'], include=['provider'], name='api_userrec_user_score_cov_idx'),
+            # Unexpired recommendations for one user in a single range scan
+            models.Index(fields=['user', 'expires_at', '-score'], name='api_userrec_user_exp_score_idx'),
+            # expires_at has a BRIN index on PostgreSQL (migration 0014) instead of a B-tree
+            # No algorithm_version index: a handful of distinct values is never
+            # selective enough to beat a scan, and every write would maintain it
         ]
         ordering = ['-score']
     
@@ -570,22 +688,45 @@ class UserRecommendation(models.Model):
         if not self.expires_at:
             self.expires_at = timezone.now() + timedelta(hours=24)
         super().save(*args, **kwargs)
+
+    @classmethod
+    def purge_expired(cls, batch_size=PURGE_BATCH_SIZE, user_id=None):
+        """
+        Delete expired recommendations in batches, optionally for one user.
+
+        Each batch is a single DELETE ... WHERE id IN (SELECT id ... LIMIT n)
+        that commits on its own when run outside a transaction, so locks and
+        dead tuples stay bounded and autovacuum keeps up. Nothing references
+        these rows and no signals listen for them, so the delete skips the
+        collector. Returns the number of rows deleted.
+        """
+        expired = cls.objects.filter(expires_at__lt=timezone.now())
+        if user_id is not None:
+            expired = expired.filter(user_id=user_id)
+        deleted = 0
+        while True:
+            batch = cls.objects.filter(pk__in=expired.order_by().values('pk')[:batch_size])
+            count = batch._raw_delete(batch.db)
+            deleted += count
+            if count < batch_size:
+                return deleted
     
     def __str__(self):
         return f"{self.user.username} -> {self.provider.business_name} ({self.score:.2f})"
 
 
 class ABTestVariant(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # No index of its own: the unique (user, experiment_name) constraint leads on user
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     experiment_name = models.CharField(max_length=100)
     variant = models.CharField(max_length=50)
     assigned_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         db_table = 'api_abtestvariant'
+        # The unique constraint's index also serves (user, experiment_name) lookups
         unique_together = ['user', 'experiment_name']
         indexes = [
-            models.Index(fields=['user', 'experiment_name']),
             models.Index(fields=['experiment_name', 'variant']),
         ]
     
@@ -601,7 +742,8 @@ class Notification(models.Model):
         ('system', 'System'),
     )
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    # No index of its own: user_type_read and unread_created both lead on user
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', db_index=False)
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES)
     title = models.CharField(max_length=255)
     message = models.TextField()
@@ -617,9 +759,20 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'notification_type']),
-            models.Index(fields=['user', 'is_read']),
-            models.Index(fields=['created_at']),
+            # Also serves (user, notification_type) lookups as its leftmost
+            # prefix, so that index must not be added back
+            models.Index(fields=['user', 'notification_type', 'is_read'], name='api_notif_user_type_read_idx'),
+            # Unread counts and the newest-first unread list are both range
+            # scans of this index, with no separate sort
+            models.Index(fields=['user', 'is_read', '-created_at'], name='api_notif_unread_created_idx'),
+            # Only unread rows are indexed, so the bell badge and unread list
+            # read a small index that shrinks as notifications are read
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=models.Q(is_read=False),
+                name='api_notif_unread_partial_idx',
+            ),
+            # created_at has a BRIN index on PostgreSQL (migration 0014) instead of a B-tree
         ]
     
     def __str__(self):
@@ -639,14 +792,20 @@ class NotificationPreference(models.Model):
 
 
 class MessageThread(models.Model):
-    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='customer_threads', limit_choices_to={'role': 'customer'})
-    provider = models.ForeignKey(User, on_delete=models.CASCADE, related_name='provider_threads', limit_choices_to={'role': 'provider'})
+    # Lookups by participant use the (participant, -updated_at) indexes below
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='customer_threads', limit_choices_to={'role': 'customer'}, db_index=False)
+    provider = models.ForeignKey(User, on_delete=models.CASCADE, related_name='provider_threads', limit_choices_to={'role': 'provider'}, db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         unique_together = ('customer', 'provider')
         ordering = ['-updated_at']
+        # Each side's inbox, newest first, is read straight off an index
+        indexes = [
+            models.Index(fields=['customer', '-updated_at'], name='api_thread_cust_upd_idx'),
+            models.Index(fields=['provider', '-updated_at'], name='api_thread_prov_upd_idx'),
+        ]
     
     def __str__(self):
         return f"Thread between {self.customer.username} and {self.provider.username}"
@@ -677,80 +836,3 @@ class Message(models.Model):
 # In production with PostGIS, uncomment the following:
 # if HAS_GIS:
 #     Address.add_to_class('location', gis_models.PointField(srid=4326, null=True, blank=True))
-
-
-class UserBehavior(models.Model):
-    ACTION_CHOICES = [
-        ('view', 'View Provider'),
-        ('search', 'Search Providers'),
-        ('favorite', 'Add to Favorites'),
-        ('contact', 'Contact Provider'),
-    ]
-    
-    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    action_type = models.CharField(max_length=20, choices=ACTION_CHOICES)
-    provider = models.ForeignKey('Provider', on_delete=models.CASCADE, null=True, blank=True)
-    search_query = models.TextField(null=True, blank=True)
-    category = models.ForeignKey('Category', on_delete=models.SET_NULL, null=True, blank=True)
-    location_lat = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
-    location_lng = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
-    session_id = models.CharField(max_length=40, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    class Meta:
-        db_table = 'api_userbehavior'
-        indexes = [
-            models.Index(fields=['user', 'action_type']),
-            models.Index(fields=['created_at']),
-            models.Index(fields=['provider']),
-            models.Index(fields=['session_id']),
-        ]
-        ordering = ['-created_at']
-    
-    def __str__(self):
-        return f"{self.user or 'Anonymous'} - {self.action_type} - {self.created_at}"
-
-
-class UserRecommendation(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    provider = models.ForeignKey('Provider', on_delete=models.CASCADE)
-    score = models.FloatField()
-    algorithm_version = models.CharField(max_length=50, default='v1.0')
-    created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
-    
-    class Meta:
-        db_table = 'api_userrecommendation'
-        unique_together = ['user', 'provider']
-        indexes = [
-            models.Index(fields=['user', '-score']),
-            models.Index(fields=['expires_at']),
-            models.Index(fields=['algorithm_version']),
-        ]
-        ordering = ['-score']
-    
-    def save(self, *args, **kwargs):
-        if not self.expires_at:
-            self.expires_at = timezone.now() + timedelta(hours=24)
-        super().save(*args, **kwargs)
-    
-    def __str__(self):
-        return f"{self.user.username} -> {self.provider.business_name} ({self.score:.2f})"
-
-
-class ABTestVariant(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    experiment_name = models.CharField(max_length=100)
-    variant = models.CharField(max_length=50)
-    assigned_at = models.DateTimeField(auto_now_add=True)
-    
-    class Meta:
-        db_table = 'api_abtestvariant'
-        unique_together = ['user', 'experiment_name']
-        indexes = [
-            models.Index(fields=['user', 'experiment_name']),
-            models.Index(fields=['experiment_name', 'variant']),
-        ]
-    
-    def __str__(self):
-        return f"{self.user.username} - {self.experiment_name}: {self.variant}"
\ No newline at end of file
@@ -1,6 +1,5 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from django.db.models import Avg
 from .models import (Category, Provider, User, Service, Address, Review, ReviewReport, Claim, Availability, Favorite,
                      Notification, NotificationPreference, MessageThread, Message, UserBehavior, 
                      UserRecommendation, ABTestVariant)
@@ -64,8 +63,7 @@ class FavoriteSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'created_at']
         
     def get_provider_rating(self, obj):
-        avg = obj.provider.reviews.aggregate(Avg('rating'))['rating__avg']
-        return round(avg, 1) if avg else None
+        return obj.provider.average_rating
         
     def get_provider_address(self, obj):
         address = obj.provider.addresses.first()
@@ -170,11 +168,10 @@ class ProviderSerializer(serializers.ModelSerializer):
                  'services', 'addresses', 'availability', 'reviews', 'average_rating', 'review_count']
         
     def get_average_rating(self, obj):
-        avg = obj.reviews.aggregate(Avg('rating'))['rating__avg']
-        return round(avg, 1) if avg else None
+        return obj.average_rating
         
     def get_review_count(self, obj):
-        return obj.reviews.count()
+        return obj.review_count
 
 class ProviderListSerializer(serializers.ModelSerializer):
     """Lighter serializer for list views to improve performance"""
@@ -183,8 +180,8 @@ class ProviderListSerializer(serializers.ModelSerializer):
         read_only=True,
         allow_null=True
     )
-    average_rating = serializers.FloatField(source='annotated_avg_rating', read_only=True)
-    review_count = serializers.IntegerField(source='annotated_review_count', read_only=True)
+    average_rating = serializers.FloatField(source='rating_avg', read_only=True)
+    review_count = serializers.IntegerField(source='reviews_count', read_only=True)
     primary_address = serializers.SerializerMethodField()
     
     # Price and distance annotations (read-only fields for queryset annotations)
@@ -321,9 +318,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         if not obj.content_object:
             return None
             
-        if obj.notification_type == 'review' and hasattr(obj.content_object, 'provider'):
-            return f"/providers/{obj.content_object.provider.id}#reviews"
-        elif obj.notification_type == 'claim' and hasattr(obj.content_object, 'provider'):
+        # provider_id comes with the prefetched target row; reading .provider
+        # would load each provider in its own query
+        if obj.notification_type == 'review' and hasattr(obj.content_object, 'provider_id'):
+            return f"/providers/{obj.content_object.provider_id}#reviews"
+        elif obj.notification_type == 'claim' and hasattr(obj.content_object, 'provider_id'):
             return f"/my-claims/{obj.content_object.id}"
         elif obj.notification_type == 'message':
             return "/messages"
@@ -585,10 +584,10 @@ class EnhancedProviderListSerializer(serializers.ModelSerializer):
                  'is_claimed', 'recommendation_score', 'created_at']
     
     def get_average_rating(self, obj):
-        return obj.reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
+        return obj.rating_avg
     
     def get_review_count(self, obj):
-        return obj.reviews.count()
+        return obj.reviews_count
     
     def get_is_claimed(self, obj):
         return hasattr(obj, 'claim') and obj.claim.status == 'approved'
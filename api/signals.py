@@ -1,8 +1,11 @@
 import logging
-from django.db.models.signals import post_save, pre_save
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
-from .models import Review, Claim, Message, User, Provider, Favorite, UserBehavior, UserRecommendation
+from .models import Review, Claim, Message, User, Provider, Favorite, UserRecommendation
+from .utils.behavior_utils import record_behavior
 from .utils.notification_utils import create_notification
 
 logger = logging.getLogger(__name__)
@@ -44,6 +47,83 @@ def create_review_notification(sender, instance, created, **kwargs):
             logger.error(f"Error creating review notification: {str(e)}")
 
 
+def adjust_review_stats(provider_id, count_delta, rating_delta):
+    """
+    Shift a provider's denormalized review stats in a single UPDATE.
+
+    The new values are computed from the row itself (F expressions), so
+    concurrent reviews of the same provider don't overwrite each other.
+    """
+    remaining = F('reviews_count') + count_delta
+    Provider.objects.filter(pk=provider_id).update(
+        reviews_count=Greatest(remaining, Value(0)),
+        rating_avg=Case(
+            # Last review removed
+            When(reviews_count__lte=-count_delta, then=Value(None)),
+            default=(Coalesce(F('rating_avg'), Value(0.0)) * F('reviews_count') + rating_delta) / remaining,
+            output_field=FloatField(),
+        ),
+    )
+
+
+@receiver(pre_save, sender=Review)
+def track_review_rating_change(sender, instance, **kwargs):
+    """
+    Track the stored provider and rating so edits can adjust provider stats
+    """
+    instance._old_rating = None
+    if instance.pk:
+        old = Review.objects.filter(pk=instance.pk).values_list('provider_id', 'rating').first()
+        if old:
+            instance._old_provider_id, instance._old_rating = old
+
+
+@receiver(post_save, sender=Review)
+def update_provider_review_stats(sender, instance, created, **kwargs):
+    """
+    Keep Provider.reviews_count and Provider.rating_avg current
+    """
+    if created:
+        adjust_review_stats(instance.provider_id, 1, instance.rating)
+        return
+
+    old_rating = getattr(instance, '_old_rating', None)
+    if old_rating is None:
+        return
+    old_provider_id = instance._old_provider_id
+    if old_provider_id == instance.provider_id:
+        if old_rating != instance.rating:
+            adjust_review_stats(instance.provider_id, 0, instance.rating - old_rating)
+    else:
+        adjust_review_stats(old_provider_id, -1, -old_rating)
+        adjust_review_stats(instance.provider_id, 1, instance.rating)
+
+
+# Review deletes refresh the stats in Review.delete / ReviewQuerySet.delete. A
+# post_delete receiver on Review would also catch cascades, but it makes
+# Django load every cascaded review and run an UPDATE per review. Deleting a
+# provider needs nothing; deleting a user refreshes the providers it reviewed.
+
+@receiver(pre_delete, sender=User)
+def track_reviewed_providers(sender, instance, **kwargs):
+    """
+    Remember which providers a user being deleted has reviewed
+    """
+    instance._reviewed_provider_ids = list(
+        Review.objects.filter(user=instance).values_list('provider_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=User)
+def refresh_reviewed_provider_stats(sender, instance, **kwargs):
+    """
+    Recompute the stats of providers that lost a deleted user's reviews
+    """
+    provider_ids = getattr(instance, '_reviewed_provider_ids', None)
+    if provider_ids:
+        Provider.refresh_review_stats(provider_ids)
+
+
 @receiver(pre_save, sender=Claim)
 def track_claim_status_change(sender, instance, **kwargs):
     """
@@ -268,7 +348,7 @@ def log_favorite_behavior(sender, instance, created, **kwargs):
     """Log user behavior when a favorite is added"""
     if created and instance.user and instance.provider:
         try:
-            UserBehavior.objects.create(
+            record_behavior(
                 user=instance.user,
                 action_type='favorite',
                 provider=instance.provider
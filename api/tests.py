@@ -1,10 +1,21 @@
-from django.test import TestCase
+import re
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from .models import Category, Provider, Review
+from .models import Category, Provider, Review, UserBehavior, UserRecommendation
+from .management.commands.generate_reviews_for_existing import Command as GenerateReviewsCommand
+from .utils import behavior_utils
 
 User = get_user_model()
 
@@ -117,3 +128,336 @@ class ReviewModelTest(TestCase):
         self.assertEqual(review.comment, 'Excellent service!')
         self.assertEqual(review.provider, self.provider)
         self.assertEqual(review.customer, self.customer)
+
+class ProviderReviewStatsTest(TestCase):
+    def setUp(self):
+        self.customers = [
+            User.objects.create_user(
+                username=f'stats_customer{i}',
+                email=f'stats{i}@test.com',
+                password='pass123',
+                role='customer'
+            )
+            for i in range(3)
+        ]
+        self.provider = Provider.objects.create(business_name='Stats Provider')
+        self.other_provider = Provider.objects.create(business_name='Other Provider')
+
+    def review(self, customer, rating, provider=None):
+        return Review.objects.create(
+            user=customer,
+            provider=provider or self.provider,
+            rating=rating
+        )
+
+    def assertStats(self, provider, count, average):
+        provider.refresh_from_db()
+        self.assertEqual(provider.reviews_count, count)
+        if average is None:
+            self.assertIsNone(provider.rating_avg)
+        else:
+            self.assertAlmostEqual(provider.rating_avg, average)
+
+    def test_create_review_updates_stats(self):
+        self.assertStats(self.provider, 0, None)
+        self.review(self.customers[0], 5)
+        self.review(self.customers[1], 2)
+        self.assertStats(self.provider, 2, 3.5)
+        self.assertEqual(self.provider.review_count, 2)
+        self.assertEqual(self.provider.average_rating, 3.5)
+
+    def test_rating_change_updates_average(self):
+        self.review(self.customers[0], 5)
+        review = self.review(self.customers[1], 1)
+        review.rating = 3
+        review.save()
+        self.assertStats(self.provider, 2, 4.0)
+
+    def test_moving_review_updates_both_providers(self):
+        self.review(self.customers[0], 5)
+        review = self.review(self.customers[1], 1)
+        review.provider = self.other_provider
+        review.save()
+        self.assertStats(self.provider, 1, 5.0)
+        self.assertStats(self.other_provider, 1, 1.0)
+
+    def test_verify_and_unverify_keep_stats(self):
+        review = self.review(self.customers[0], 4)
+        review.is_verified = True
+        review.save()
+        self.assertStats(self.provider, 1, 4.0)
+        review.is_verified = False
+        review.save()
+        self.assertStats(self.provider, 1, 4.0)
+
+    def test_delete_review_updates_stats(self):
+        first = self.review(self.customers[0], 5)
+        second = self.review(self.customers[1], 2)
+        first.delete()
+        self.assertStats(self.provider, 1, 2.0)
+        second.delete()
+        self.assertStats(self.provider, 0, None)
+
+    def test_queryset_delete_refreshes_stats(self):
+        self.review(self.customers[0], 5)
+        self.review(self.customers[1], 2)
+        self.review(self.customers[0], 4, provider=self.other_provider)
+        Review.objects.filter(rating__lt=5).delete()
+        self.assertStats(self.provider, 1, 5.0)
+        self.assertStats(self.other_provider, 0, None)
+
+    def test_deleting_user_refreshes_reviewed_providers(self):
+        self.review(self.customers[0], 5)
+        self.review(self.customers[1], 2)
+        self.review(self.customers[1], 4, provider=self.other_provider)
+        self.customers[1].delete()
+        self.assertStats(self.provider, 1, 5.0)
+        self.assertStats(self.other_provider, 0, None)
+
+    def test_deleting_provider_deletes_its_reviews(self):
+        self.review(self.customers[0], 5)
+        self.review(self.customers[1], 2)
+        self.provider.delete()
+        self.assertFalse(Review.objects.exists())
+
+    def test_queryset_update_refreshes_stats(self):
+        self.review(self.customers[0], 3)
+        Review.objects.filter(provider=self.provider).update(rating=1)
+        self.assertStats(self.provider, 1, 1.0)
+
+    def test_queryset_update_moving_reviews_refreshes_stats(self):
+        self.review(self.customers[0], 3)
+        Review.objects.filter(provider=self.provider).update(provider=self.other_provider)
+        self.assertStats(self.provider, 0, None)
+        self.assertStats(self.other_provider, 1, 3.0)
+
+    def test_stale_provider_save_keeps_stats(self):
+        stale = Provider.objects.get(pk=self.provider.pk)
+        self.review(self.customers[0], 4)
+        stale.business_name = 'Renamed Provider'
+        stale.save()
+        self.assertStats(self.provider, 1, 4.0)
+        self.assertEqual(self.provider.business_name, 'Renamed Provider')
+
+    def test_deferred_provider_save_leaves_deferred_fields(self):
+        self.review(self.customers[0], 4)
+        partial = Provider.objects.only('business_name').get(pk=self.provider.pk)
+        partial.business_name = 'Renamed Provider'
+        partial.save()
+        # Django limits the save to the loaded fields instead of fetching the rest
+        self.assertIn('description', partial.get_deferred_fields())
+        self.assertStats(self.provider, 1, 4.0)
+        self.assertEqual(self.provider.business_name, 'Renamed Provider')
+
+    def test_saving_deleted_provider_inserts_it_again(self):
+        provider = Provider.objects.get(pk=self.other_provider.pk)
+        Provider.objects.filter(pk=provider.pk).delete()
+        provider.save()
+        self.assertTrue(Provider.objects.filter(pk=provider.pk).exists())
+
+    def test_refresh_review_stats_repairs_counters(self):
+        self.review(self.customers[0], 4)
+        self.review(self.customers[1], 2)
+        Provider.objects.filter(pk=self.provider.pk).update(reviews_count=0, rating_avg=None)
+        Provider.refresh_review_stats([self.provider.pk])
+        self.assertStats(self.provider, 2, 3.0)
+
+
+class BuildRecommendationsWorkersTest(TransactionTestCase):
+    # Worker processes read through their own connections, so the fixtures
+    # must be committed rather than held in a test transaction
+
+    def setUp(self):
+        providers = [
+            Provider.objects.create(business_name=f'Recs Provider {i}')
+            for i in range(4)
+        ]
+        for i in range(6):
+            user = User.objects.create_user(
+                username=f'recs_user{i}',
+                email=f'recs{i}@test.com',
+                password='pass123',
+                role='customer'
+            )
+            # Enough high ratings for the cold start's popular providers
+            for provider in providers:
+                Review.objects.create(user=user, provider=provider, rating=5 - i % 2)
+
+    def build(self, workers):
+        call_command(
+            'build_recommendations', full_rebuild=True, batch_size=2,
+            workers=workers, verbosity=0
+        )
+        return sorted(UserRecommendation.objects.values_list(
+            'user_id', 'provider_id', 'score', 'algorithm_version'
+        ))
+
+    def test_workers_build_same_recommendations(self):
+        serial = self.build(workers=1)
+        UserRecommendation.objects.all().delete()
+        self.assertTrue(serial)
+        self.assertEqual(self.build(workers=2), serial)
+
+
+@override_settings(BEHAVIOR_FLUSH_SYNC=True)
+class BehaviorBufferTest(TransactionTestCase):
+    # Foreign keys are only checked when a transaction commits, so a bad row
+    # fails the flush only outside a test transaction
+
+    def setUp(self):
+        behavior_utils._behavior_queue.clear()
+        self.user = User.objects.create_user(
+            username='behavior_user',
+            email='behavior@test.com',
+            password='pass123',
+            role='customer'
+        )
+        self.provider = Provider.objects.create(business_name='Behavior Provider')
+
+    def tearDown(self):
+        behavior_utils._behavior_queue.clear()
+
+    def test_flush_writes_queued_events(self):
+        behavior_utils.record_behavior(user=self.user, action_type='view', provider_id=self.provider.pk)
+        behavior_utils.record_behavior(user=self.user, action_type='search', search_query='plumber')
+        self.assertEqual(UserBehavior.objects.count(), 0)
+
+        self.assertEqual(behavior_utils.flush_behavior_events(), 2)
+        self.assertEqual(
+            sorted(UserBehavior.objects.values_list('action_type', flat=True)),
+            ['search', 'view']
+        )
+
+    def test_flush_empties_queue(self):
+        behavior_utils.record_behavior(user=self.user, action_type='search', search_query='plumber')
+        behavior_utils.flush_behavior_events()
+        self.assertEqual(len(behavior_utils._behavior_queue), 0)
+        self.assertEqual(behavior_utils.flush_behavior_events(), 0)
+        self.assertEqual(UserBehavior.objects.count(), 1)
+
+    def test_bad_row_does_not_drop_good_rows(self):
+        behavior_utils.record_behavior(user=self.user, action_type='view', provider_id=self.provider.pk)
+        behavior_utils.record_behavior(user=self.user, action_type='view', provider_id=self.provider.pk + 1000)
+        behavior_utils.record_behavior(user=self.user, action_type='search', search_query='plumber')
+
+        with self.assertLogs(behavior_utils.logger, level='ERROR'):
+            self.assertEqual(behavior_utils.flush_behavior_events(), 2)
+        self.assertEqual(UserBehavior.objects.count(), 2)
+        self.assertFalse(UserBehavior.objects.exclude(provider=None).exclude(provider=self.provider).exists())
+
+    def test_full_queue_flushes(self):
+        with mock.patch.object(behavior_utils, 'BEHAVIOR_FLUSH_SIZE', 2):
+            behavior_utils.record_behavior(user=self.user, action_type='search', search_query='a')
+            self.assertEqual(UserBehavior.objects.count(), 0)
+            behavior_utils.record_behavior(user=self.user, action_type='search', search_query='b')
+        self.assertEqual(UserBehavior.objects.count(), 2)
+
+    def test_provider_view_queues_resolved_pk(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get(reverse('provider-detail', args=[self.provider.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(behavior_utils._behavior_queue), 1)
+        event = behavior_utils._behavior_queue[0]
+        self.assertEqual((event.action_type, event.provider_id), ('view', self.provider.pk))
+
+
+class PurgeExpiredRecommendationsTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f'purge_user{i}',
+                email=f'purge{i}@test.com',
+                password='pass123',
+                role='customer'
+            )
+            for i in range(2)
+        ]
+        self.providers = [
+            Provider.objects.create(business_name=f'Purge Provider {i}')
+            for i in range(6)
+        ]
+
+    def recommend(self, user, providers, hours):
+        for provider in providers:
+            UserRecommendation.objects.create(
+                user=user,
+                provider=provider,
+                score=0.5,
+                expires_at=timezone.now() + timedelta(hours=hours)
+            )
+
+    def test_purges_expired_across_batches(self):
+        self.recommend(self.users[0], self.providers[:5], hours=-1)
+        with CaptureQueriesContext(connection) as queries:
+            deleted = UserRecommendation.purge_expired(batch_size=2)
+        self.assertEqual(deleted, 5)
+        self.assertFalse(UserRecommendation.objects.exists())
+        deletes = [q for q in queries.captured_queries if q['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 3)
+
+    def test_keeps_unexpired(self):
+        self.recommend(self.users[0], self.providers[:3], hours=-1)
+        self.recommend(self.users[0], self.providers[3:], hours=1)
+        self.assertEqual(UserRecommendation.purge_expired(batch_size=2), 3)
+        self.assertEqual(
+            set(UserRecommendation.objects.values_list('provider_id', flat=True)),
+            {provider.pk for provider in self.providers[3:]}
+        )
+
+    def test_purges_only_given_user(self):
+        self.recommend(self.users[0], self.providers[:3], hours=-1)
+        self.recommend(self.users[1], self.providers[:3], hours=-1)
+        self.assertEqual(UserRecommendation.purge_expired(batch_size=2, user_id=self.users[1].pk), 3)
+        self.assertEqual(
+            set(UserRecommendation.objects.values_list('user_id', flat=True)),
+            {self.users[0].pk}
+        )
+
+
+class GenerateReviewsForExistingTest(TestCase):
+    def setUp(self):
+        self.customers = [
+            User.objects.create_user(
+                username=f'gen_customer{i}',
+                email=f'gen{i}@test.com',
+                password='pass123',
+                role='customer'
+            )
+            for i in range(5)
+        ]
+        self.providers = [
+            Provider.objects.create(business_name=f'Gen Provider {i}')
+            for i in range(2)
+        ]
+        Review.objects.create(user=self.customers[0], provider=self.providers[0], rating=4)
+
+    def generate(self, **options):
+        out = StringIO()
+        call_command('generate_reviews_for_existing', stdout=out, **options)
+        created, total = re.search(
+            r'Created (\d+) new reviews\. Total reviews now: (\d+)\.', out.getvalue()
+        ).groups()
+        return int(created), int(total)
+
+    def test_rerun_reports_inserted_reviews(self):
+        self.assertEqual(self.generate(per_provider=3, max=3), (5, 6))
+        self.assertEqual(Review.objects.count(), 6)
+        # Every provider already has its reviews, so nothing new goes in
+        self.assertEqual(self.generate(per_provider=3, max=3), (0, 6))
+        self.assertEqual(self.generate(per_provider=4, max=4), (2, 8))
+        self.assertEqual(Review.objects.count(), 8)
+
+    def test_bulk_insert_skips_existing_pairs(self):
+        now = timezone.now()
+        reviews = [
+            Review(user=customer, provider=self.providers[0], rating=5, created_at=now, updated_at=now)
+            for customer in self.customers[:3]
+        ]
+        # The first pair already has a review, which must be kept and not counted
+        self.assertEqual(GenerateReviewsCommand()._bulk_insert(reviews, batch_size=100), 2)
+        self.assertEqual(Review.objects.filter(provider=self.providers[0]).count(), 3)
+        self.assertEqual(
+            Review.objects.get(user=self.customers[0], provider=self.providers[0]).rating, 4
+        )
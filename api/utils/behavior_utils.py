@@ -0,0 +1,151 @@
+"""
+Buffered logging of UserBehavior events.
+
+Provider views and searches record a behavior row on every request. Instead of
+one INSERT per request, events are queued in the process and written together
+in a single multi-row INSERT, once BEHAVIOR_FLUSH_SIZE events are waiting or
+BEHAVIOR_FLUSH_INTERVAL seconds after the first one was queued. Flushes run on
+a background thread, never in the request that queued the event.
+
+Events still queued when a worker is killed are lost. That is acceptable for
+behavior logs, which only feed recommendations and analytics. Set
+BEHAVIOR_FLUSH_SIZE=1 to write every event straight away.
+
+With settings.BEHAVIOR_FLUSH_SYNC (used by the tests) there is no background
+thread: a full queue is flushed in the calling thread, and anything less
+waits for an explicit flush_behavior_events().
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from ..models import UserBehavior
+
+logger = logging.getLogger(__name__)
+
+# Queued events that trigger an immediate flush
+BEHAVIOR_FLUSH_SIZE = max(1, int(os.environ.get('BEHAVIOR_FLUSH_SIZE', 100)))
+# Longest an event waits in the queue, in seconds
+BEHAVIOR_FLUSH_INTERVAL = float(os.environ.get('BEHAVIOR_FLUSH_INTERVAL', 1.0))
+# Rows per INSERT statement when a flush is large
+BEHAVIOR_INSERT_BATCH_SIZE = 1000
+
+_behavior_queue = deque()
+_flush_lock = threading.Lock()
+_flush_timer = None
+# Whether the pending timer is a zero-delay flush for a full queue
+_flush_timer_immediate = False
+
+
+def record_behavior(**fields):
+    """
+    Queue a UserBehavior event for the next flush
+
+    Args:
+        **fields: UserBehavior field values (user, action_type, provider, ...)
+
+    Note:
+        created_at is set when the event is written, at most
+        BEHAVIOR_FLUSH_INTERVAL seconds after the action.
+    """
+    global _flush_timer, _flush_timer_immediate
+    _behavior_queue.append(UserBehavior(**fields))
+    flush_now = len(_behavior_queue) >= BEHAVIOR_FLUSH_SIZE
+    if getattr(settings, 'BEHAVIOR_FLUSH_SYNC', False):
+        if flush_now:
+            flush_behavior_events()
+        return
+    with _flush_lock:
+        if _flush_timer is not None and (_flush_timer_immediate or not flush_now):
+            return
+        # A full queue replaces the pending timer with one that fires at once
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+        _flush_timer = threading.Timer(
+            0 if flush_now else BEHAVIOR_FLUSH_INTERVAL, _flush_from_timer
+        )
+        _flush_timer.daemon = True
+        _flush_timer_immediate = flush_now
+        _flush_timer.start()
+
+
+def flush_behavior_events():
+    """
+    Write every queued behavior event in one bulk insert
+
+    Returns:
+        Number of events written
+    """
+    global _flush_timer, _flush_timer_immediate
+    with _flush_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+            _flush_timer_immediate = False
+        events = []
+        while _behavior_queue:
+            events.append(_behavior_queue.popleft())
+
+    if not events:
+        return 0
+    try:
+        # Savepoint, so a failed insert can't break a surrounding transaction
+        with transaction.atomic(savepoint=True):
+            UserBehavior.objects.bulk_create(events, batch_size=BEHAVIOR_INSERT_BATCH_SIZE)
+    except Exception as e:
+        logger.warning(
+            f"Bulk insert of {len(events)} behavior events failed, "
+            f"retrying one by one: {str(e)}"
+        )
+        return _insert_one_by_one(events)
+    return len(events)
+
+
+def _insert_one_by_one(events):
+    """
+    Write events one at a time, skipping the ones that fail
+
+    One bad row, e.g. a provider deleted while its view event was queued,
+    shouldn't drop the rest of the batch.
+
+    Returns:
+        Number of events written
+    """
+    written = 0
+    dropped = []
+    for event in events:
+        try:
+            with transaction.atomic(savepoint=True):
+                event.save(force_insert=True)
+        except Exception:
+            dropped.append(event)
+        else:
+            written += 1
+    if dropped:
+        logger.error(
+            f"Dropped {len(dropped)} of {len(events)} behavior events: "
+            + ', '.join(
+                f"(user={event.user_id}, provider={event.provider_id}, "
+                f"category={event.category_id}, action={event.action_type})"
+                for event in dropped
+            )
+        )
+    return written
+
+
+def _flush_from_timer():
+    try:
+        flush_behavior_events()
+    finally:
+        # Django connections are per thread; don't leak one per timer
+        connection.close()
+
+
+# Write whatever is still queued when the worker shuts down cleanly
+atexit.register(flush_behavior_events)
@@ -8,7 +8,6 @@ import pandas as pd
 from sklearn.decomposition import TruncatedSVD
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from django.db.models import Count, Avg
 from django.conf import settings
 import pickle
 import os
@@ -173,23 +172,32 @@ class CollaborativeFilteringEngine:
         
         return scores
     
+    @staticmethod
+    def provider_factors_path(filepath):
+        """Path of the raw provider factor matrix stored next to the model pickle"""
+        return os.path.splitext(filepath)[0] + '_provider_factors.npy'
+    
     def save_model(self, filepath):
         """Save trained model to disk"""
         if not self.is_trained:
             return False
         
         try:
+            # Provider factors are stored as a plain .npy file so worker
+            # processes can memory-map them instead of unpickling a copy each
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            np.save(self.provider_factors_path(filepath), np.asarray(self.provider_factors))
+            
             model_data = {
                 'svd': self.svd,
                 'user_factors': self.user_factors,
-                'provider_factors': self.provider_factors,
+                'provider_factors': None,
                 'user_index_map': self.user_index_map,
                 'provider_index_map': self.provider_index_map,
                 'n_components': self.n_components,
                 'is_trained': self.is_trained
             }
             
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
             with open(filepath, 'wb') as f:
                 pickle.dump(model_data, f)
             return True
@@ -210,6 +218,10 @@ class CollaborativeFilteringEngine:
             self.svd = model_data['svd']
             self.user_factors = model_data['user_factors']
             self.provider_factors = model_data['provider_factors']
+            factors_path = self.provider_factors_path(filepath)
+            if os.path.exists(factors_path):
+                # Read-only mapping: processes loading the same model share pages
+                self.provider_factors = np.load(factors_path, mmap_mode='r')
             self.user_index_map = model_data['user_index_map']
             self.provider_index_map = model_data['provider_index_map']
             self.n_components = model_data['n_components']
@@ -419,8 +431,8 @@ class LocationBasedEngine:
             return None
         
         # Calculate centroid of user's activity
-        lats = [float(b.location_lat) for b in behaviors]
-        lngs = [float(b.location_lng) for b in behaviors]
+        lats = [b.location_lat for b in behaviors]
+        lngs = [b.location_lng for b in behaviors]
         
         centroid_lat = sum(lats) / len(lats)
         centroid_lng = sum(lngs) / len(lngs)
@@ -577,13 +589,10 @@ class ColdStartHandler:
             )
         
         # Order by rating and review count
-        popular_providers = queryset.annotate(
-            avg_rating=Avg('reviews__rating'),
-            review_count=Count('reviews')
-        ).filter(
-            avg_rating__gte=4.0,  # High-rated providers
-            review_count__gte=5   # Minimum reviews for reliability
-        ).order_by('-avg_rating', '-review_count')
+        popular_providers = queryset.filter(
+            rating_avg__gte=4.0,  # High-rated providers
+            reviews_count__gte=5   # Minimum reviews for reliability
+        ).distinct().order_by('-rating_avg', '-reviews_count')
         
         return list(popular_providers[:top_k].values_list('id', flat=True))
     
@@ -24,6 +24,7 @@ from .serializers import (
     RecommendationSerializer, ABTestVariantSerializer, EnhancedProviderListSerializer
 )
 from .permissions import ClaimCreatePermission, ClaimOwnerPermission
+from .utils.behavior_utils import record_behavior
 from .utils import send_claim_verification_email, approve_claim as approve_claim_util, reject_claim as reject_claim_util
 
 
@@ -362,7 +363,7 @@ class ProviderListView(generics.ListAPIView):
             
             # Only log if there's a search query or location-based search
             if search_query or (lat and lng):
-                UserBehavior.objects.create(
+                record_behavior(
                     user=request.user,
                     action_type='search',
                     search_query=search_query,
@@ -432,9 +433,7 @@ class ProviderListView(generics.ListAPIView):
         # Filter by minimum rating
         min_rating = self.request.query_params.get('min_rating', None)
         if min_rating:
-            queryset = queryset.annotate(
-                avg_rating=Avg('reviews__rating')
-            ).filter(avg_rating__gte=min_rating)
+            queryset = queryset.filter(rating_avg__gte=min_rating)
         
         # Price range filtering with aggregation
         min_price = self.request.query_params.get('min_price', None)
@@ -575,19 +574,13 @@ class ProviderListView(generics.ListAPIView):
             except (ValueError, TypeError):
                 pass
         
-        # Always add review and rating annotations for sorting and serialization
-        queryset = queryset.annotate(
-            annotated_review_count=Count('reviews', distinct=True),
-            annotated_avg_rating=Avg('reviews__rating')
-        )
-
         # Sorting functionality
         ordering = self.request.query_params.get('ordering', None)
         valid_orderings = ['distance', '-distance', 'rating', '-rating', 'price', '-price', 'relevance', 'name', '-name']
         
         if ordering and ordering in valid_orderings:
             if ordering in ['rating', '-rating']:
-                queryset = queryset.order_by('annotated_avg_rating' if ordering == 'rating' else '-annotated_avg_rating')
+                queryset = queryset.order_by('rating_avg' if ordering == 'rating' else '-rating_avg')
             elif ordering in ['price', '-price']:
                 from django.db.models import Min
                 queryset = queryset.annotate(min_price=Min('services__price'))
@@ -622,7 +615,7 @@ class ProviderListView(generics.ListAPIView):
                     queryset = queryset.order_by('distance' if ordering == 'distance' else '-distance')
         else:
             # Default ordering: claimed providers first, then by rating
-            queryset = queryset.order_by('-is_claimed', '-annotated_avg_rating')
+            queryset = queryset.order_by('-is_claimed', '-rating_avg')
         
         return queryset.distinct()
 
@@ -742,16 +735,16 @@ class ProviderDetailView(generics.RetrieveAPIView):
     permission_classes = [AllowAny]
     
     def retrieve(self, request, *args, **kwargs):
-        # Log user behavior for provider view
-        response = super().retrieve(request, *args, **kwargs)
+        instance = self.get_object()
+        response = Response(self.get_serializer(instance).data)
         
-        # Only log behavior for authenticated users
+        # Log user behavior for provider view (authenticated users only), by
+        # the resolved pk rather than the raw URL value
         if request.user.is_authenticated:
-            provider = self.get_object()
-            UserBehavior.objects.create(
+            record_behavior(
                 user=request.user,
                 action_type='view',
-                provider=provider,
+                provider_id=instance.pk,
                 session_id=request.session.session_key
             )
         
@@ -977,9 +970,7 @@ def recommendations_view(request, provider_id):
         recommended = Provider.objects.filter(
             services__category__in=categories,
             is_active=True
-        ).exclude(pk=provider_id).annotate(
-            avg_rating=Avg('reviews__rating')
-        ).order_by('-avg_rating', '-review_count')[:5]
+        ).exclude(pk=provider_id).distinct().order_by('-rating_avg', '-reviews_count')[:5]
         
         serializer = ProviderListSerializer(recommended, many=True)
         return Response(serializer.data)
@@ -1071,8 +1062,8 @@ def user_dashboard(request):
             data['provider'] = ProviderSerializer(provider).data
             
             # Add provider analytics summary
-            total_reviews = provider.reviews.count()
-            avg_rating = provider.reviews.aggregate(Avg('rating'))['rating__avg']
+            total_reviews = provider.reviews_count
+            avg_rating = provider.rating_avg
             total_services = provider.services.filter(is_active=True).count()
             total_favorites = provider.favorited_by.count()
             
@@ -1180,8 +1171,8 @@ class ProviderAnalyticsView(generics.GenericAPIView):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         # Basic analytics
-        total_reviews = provider.reviews.count()
-        average_rating = provider.reviews.aggregate(Avg('rating'))['rating__avg']
+        total_reviews = provider.reviews_count
+        average_rating = provider.rating_avg
         total_services = provider.services.filter(is_active=True).count()
         total_favorites = provider.favorited_by.count()
         
@@ -1554,7 +1545,9 @@ class NotificationListView(generics.ListAPIView):
     pagination_class = PageNumberPagination
     
     def get_queryset(self):
-        queryset = Notification.objects.filter(user=self.request.user).select_related('content_type')
+        # Targets are loaded with one query per content type instead of one
+        # per notification when the serializer builds related_object_url
+        queryset = Notification.objects.filter(user=self.request.user).prefetch_related('content_object')
         
         # Filter by read status
         is_read = self.request.query_params.get('is_read')
@@ -1760,9 +1753,7 @@ class PersonalizedRecommendationsView(generics.ListAPIView):
                 basic_recommendations = Provider.objects.filter(
                     is_active=True,
                     services__category__in=category_ids
-                ).annotate(
-                    avg_rating=Avg('reviews__rating')
-                ).order_by('-avg_rating')[:10]
+                ).distinct().order_by('-rating_avg')[:10]
                 
                 # Convert to recommendation format
                 from datetime import timedelta
@@ -1770,7 +1761,7 @@ class PersonalizedRecommendationsView(generics.ListAPIView):
                 for provider in basic_recommendations:
                     recommendations_data.append({
                         'provider': provider,
-                        'recommendation_score': provider.avg_rating or 3.0,
+                        'recommendation_score': provider.rating_avg or 3.0,
                         'algorithm_version': 'basic_fallback',
                         'confidence_level': 'low',
                         'explanation': 'Recommended based on popular providers in your preferred categories',
@@ -159,6 +159,13 @@ else:
             'PASSWORD': config('DATABASE_PASSWORD'),
             'HOST': config('DATABASE_HOST', default='127.0.0.1'),
             'PORT': config('DATABASE_PORT', default=5432, cast=int),
+            # Keep connections open across requests/transactions instead of
+            # reconnecting each time; health checks drop stale ones
+            'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=600, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            # Set when connecting through pgbouncer in transaction pooling mode,
+            # which cannot keep server-side cursors (QuerySet.iterator) open
+            'DISABLE_SERVER_SIDE_CURSORS': config('DATABASE_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
         }
     }
 
@@ -181,6 +188,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# seed_data stores cheap MD5 hashes for its generated users; accept them in
+# development only. PBKDF2 stays first, so a login re-hashes with it.
+if DEBUG:
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/